@@ -3,12 +3,31 @@ from __future__ import annotations
 
 import argparse
 import csv
+import functools
 import json
 import logging
+import re
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
-from urllib.parse import urlparse
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+try:  # optional C automaton for alias matching; falls back to a linear scan
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+
+try:  # optional incremental parser so large JSON manifests are never fully loaded
+    import ijson
+    IJSON_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    ijson = None
+    IJSON_AVAILABLE = False
 
 from .core import Downloader
 
@@ -49,9 +68,109 @@ ALIAS_MAP: Tuple[Tuple[str, str], ...] = (
 )
 
 DEFAULT_OUTPUT_DIR = Path('downloads')
-
-
-@dataclass
+# download options for every supported handler, built once and shared
+# read-only by all items; a single lookup both checks support and picks opts.
+# yt-dlp based handlers reuse session cookies when available.
+_YTDLP_OPTS: Mapping[str, object] = MappingProxyType({'use_session': True})
+_HANDLER_OPTS: Dict[str, Mapping[str, object]] = {
+    source: _YTDLP_OPTS for source in SUPPORTED_SOURCES
+}
+_HANDLER_OPTS['Instagram'] = MappingProxyType({'auth': 'auto'})
+_HANDLER_OPTS['Google Drive'] = MappingProxyType({})
+
+# line-delimited canonical URLs finished by earlier runs, kept inside out_dir
+COMPLETED_LOG_NAME = '.completed'
+
+
+def _build_alias_automaton():
+    """Compile ALIAS_MAP into an Aho-Corasick automaton keyed on alias priority."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for priority, (alias, handler) in enumerate(ALIAS_MAP):
+        automaton.add_word(alias, (priority, handler))
+    automaton.make_automaton()
+    return automaton
+
+
+_ALIAS_AUTOMATON = _build_alias_automaton()
+# without pyahocorasick the scan runs in the C regex engine instead: the
+# lookahead reports an alias at every offset (overlaps included) and the
+# alternation order picks the highest-priority alias at each one
+_ALIAS_RE = re.compile('(?=(' + '|'.join(re.escape(alias) for alias, _ in ALIAS_MAP) + '))')
+_ALIAS_PRIORITY: Dict[str, int] = {alias: priority for priority, (alias, _) in enumerate(ALIAS_MAP)}
+# exact hits (bare source hints such as 'twitter') skip the substring scan
+_EXACT_ALIASES: Dict[str, str] = dict(ALIAS_MAP)
+# host-shaped aliases ('x.com', 'youtu.be', ...) resolve a bare netloc in O(1)
+_NETLOC_ALIASES: Dict[str, str] = {alias: handler for alias, handler in ALIAS_MAP if '.' in alias}
+
+
+class HostDispatcher:
+    """Run jobs through ``submit`` with at most ``per_host_max`` in flight per host.
+
+    Jobs wait in per-host queues instead of in the executor. A manifest that
+    lists one host many times in a row therefore cannot fill every worker
+    with downloads waiting on that host while other hosts sit idle. ``add``
+    blocks once more than ``4 * max_workers`` jobs are queued, so a streamed
+    manifest is not read ahead of the downloads. Driven from a single thread.
+    """
+
+    def __init__(self, submit, max_workers: int, per_host_max: int):
+        self._submit = submit
+        self._max_workers = max(1, max_workers)
+        self._per_host_max = max(1, per_host_max)
+        self._pending: Dict[str, deque] = {}
+        self._active: Dict[str, int] = defaultdict(int)
+        self._running: Dict[object, str] = {}
+        self._queued = 0
+        self._max_queued = 4 * self._max_workers
+
+    def add(self, host: str, fn, *args) -> List:
+        """Queue ``fn(*args)`` for ``host``; return the futures finished since the last call.
+
+        Waits for running jobs to finish while the queue is over its bound.
+        """
+        self._pending.setdefault(host, deque()).append((fn, args))
+        self._queued += 1
+        done = [future for future in self._running if future.done()]
+        for future in done:
+            self._release(future)
+        self._fill()
+        while self._queued > self._max_queued and self._running:
+            finished, _ = wait(self._running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                self._release(future)
+            self._fill()
+            done.extend(finished)
+        return done
+
+    def drain(self) -> Iterable:
+        """Yield futures as they finish until nothing is queued or running."""
+        while self._running:
+            done, _ = wait(self._running, return_when=FIRST_COMPLETED)
+            for future in done:
+                self._release(future)
+            self._fill()
+            yield from done
+
+    def _release(self, future) -> None:
+        self._active[self._running.pop(future)] -= 1
+
+    def _fill(self) -> None:
+        for host in list(self._pending):
+            if len(self._running) >= self._max_workers:
+                return
+            jobs = self._pending[host]
+            while jobs and self._active[host] < self._per_host_max and len(self._running) < self._max_workers:
+                fn, args = jobs.popleft()
+                self._queued -= 1
+                self._active[host] += 1
+                self._running[self._submit(fn, *args)] = host
+            if not jobs:
+                del self._pending[host]
+
+
+@dataclass(frozen=True, slots=True)
 class ManifestItem:
     source_hint: str
     url: str
@@ -61,65 +180,163 @@ def normalize_url(url: str) -> str:
     return url.strip()
 
 
-def detect_handler(source_hint: str, url: str) -> Optional[str]:
-    """Return the Downloader handler name for a given item or None if unsupported."""
-    candidates = [source_hint or '', urlparse(url).netloc]
-    for value in candidates:
-        handler = match_alias(value)
-        if handler:
-            return handler
-    return None
+def canonicalize_url(url: str) -> str:
+    """Return a dedup key: lowercase scheme/host, no fragment, no utm_* params."""
+    parts = urlsplit(url)
+    query = parts.query
+    if 'utm_' in query:
+        query = urlencode([(k, v) for k, v in parse_qsl(query, keep_blank_values=True) if not k.startswith('utm_')])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ''))
 
 
+def detect_handler(source_hint: str, url: str) -> Optional[str]:
+    """Return the Downloader handler name for a given item or None if unsupported."""
+    handler = match_alias(source_hint or '')
+    if handler:
+        return handler
+    host = host_of(url)
+    if not host:
+        return None
+    return _NETLOC_ALIASES.get(host) or match_alias(host)
+
+
+def host_of(url: str) -> str:
+    """Return the lowercased netloc of a URL without a leading 'www.'.
+
+    Only http(s) and scheme-relative URLs have a host here; anything else
+    (CSV junk, bare paths, other schemes) yields '' without running urlparse.
+    """
+    head = url[:8].lower()
+    if head.startswith('https://'):
+        start = 8
+    elif head.startswith('http://'):
+        start = 7
+    elif head.startswith('//'):
+        start = 2
+    else:
+        return ''
+    # the netloc ends at the first path, query or fragment delimiter
+    end = len(url)
+    for delimiter in '/?#':
+        pos = url.find(delimiter, start, end)
+        if pos != -1:
+            end = pos
+    netloc = url[start:end].lower()
+    return netloc[4:] if netloc.startswith('www.') else netloc
+
+
+@functools.lru_cache(maxsize=8192)
 def match_alias(value: str) -> Optional[str]:
     value = (value or '').lower()
-    for alias, handler in ALIAS_MAP:
-        if alias in value:
-            return handler
-    return None
+    handler = _EXACT_ALIASES.get(value)
+    if handler:
+        return handler
+    if _ALIAS_AUTOMATON is not None:
+        # several aliases may occur in one value; the earliest ALIAS_MAP entry wins
+        hits = [hit for _end, hit in _ALIAS_AUTOMATON.iter(value)]
+        return min(hits)[1] if hits else None
+    priorities = [_ALIAS_PRIORITY[m.group(1)] for m in _ALIAS_RE.finditer(value)]
+    return ALIAS_MAP[min(priorities)][1] if priorities else None
 
 
 def load_manifest(path: Path, fmt: Optional[str] = None) -> List[ManifestItem]:
+    return list(iter_manifest(path, fmt))
+
+
+def iter_manifest(path: Path, fmt: Optional[str] = None) -> Iterable[ManifestItem]:
+    """Yield manifest items lazily; JSON is streamed when ijson is installed."""
     fmt = (fmt or path.suffix.lstrip('.')).lower()
     if fmt not in {'json', 'csv'}:
         raise ValueError(f'Unsupported manifest format: {fmt}')
     if fmt == 'json':
-        return list(_from_json(path))
-    return list(_from_csv(path))
+        return _from_json(path)
+    return _from_csv(path)
 
 
 def _from_json(path: Path) -> Iterable[ManifestItem]:
+    if IJSON_AVAILABLE:
+        yield from _stream_json(path)
+        return
     data = json.loads(path.read_text(encoding='utf-8'))
     if isinstance(data, dict):
         for source, urls in data.items():
-            if isinstance(urls, dict):
-                urls = urls.get('items') or []
-            if not isinstance(urls, Sequence):
-                continue
-            for url in urls:
-                if not url:
-                    continue
-                yield ManifestItem(source_hint=str(source), url=normalize_url(str(url)))
+            yield from _source_items(source, urls)
     elif isinstance(data, Sequence):
-        for item in data:
-            if isinstance(item, dict) and 'url' in item:
-                yield ManifestItem(source_hint=str(item.get('source') or ''), url=normalize_url(str(item['url'])))
+        for entry in data:
+            yield from _entry_items(entry)
     else:
         raise ValueError('JSON manifest must be an object or array')
 
 
+def _stream_json(path: Path) -> Iterable[ManifestItem]:
+    with path.open('rb') as fp:
+        root = _peek_json_root(fp)
+        if root == b'{':
+            for source, urls in ijson.kvitems(fp, ''):
+                yield from _source_items(source, urls)
+        elif root == b'[':
+            for entry in ijson.items(fp, 'item'):
+                yield from _entry_items(entry)
+        else:
+            raise ValueError('JSON manifest must be an object or array')
+
+
+def _peek_json_root(fp) -> bytes:
+    """Return the first significant byte of the document and rewind."""
+    while True:
+        chunk = fp.read(1)
+        if not chunk or not chunk.isspace():
+            break
+    fp.seek(0)
+    return chunk
+
+
+def _source_items(source, urls) -> Iterable[ManifestItem]:
+    if isinstance(urls, dict):
+        urls = urls.get('items') or []
+    if not isinstance(urls, Sequence):
+        return
+    for url in urls:
+        if not url:
+            continue
+        yield ManifestItem(source_hint=str(source), url=normalize_url(str(url)))
+
+
+def _entry_items(entry) -> Iterable[ManifestItem]:
+    if isinstance(entry, dict) and 'url' in entry:
+        yield ManifestItem(source_hint=str(entry.get('source') or ''), url=normalize_url(str(entry['url'])))
+
+
 def _from_csv(path: Path) -> Iterable[ManifestItem]:
     with path.open(newline='', encoding='utf-8') as fp:
-        reader = csv.DictReader(fp)
+        reader = csv.reader(fp)
+        header = next(reader, None)
+        if not header:
+            return
+        # resolve columns once instead of building a dict per row
+        source_i = _column_index(header, 'source', 'Source')
+        items_i = _column_index(header, 'items_comma_separated', 'items')
+        if items_i is None:
+            return
         for row in reader:
-            source = row.get('source') or row.get('Source') or ''
-            items_field = row.get('items_comma_separated') or row.get('items') or ''
+            if len(row) <= items_i:
+                continue
+            items_field = row[items_i]
             if not items_field:
                 continue
+            source = row[source_i] if source_i is not None and source_i < len(row) else ''
             # items are stored as comma-separated URLs; tolerate stray spaces
-            parts = [p.strip() for p in items_field.split(',') if p.strip()]
-            for part in parts:
-                yield ManifestItem(source_hint=source, url=normalize_url(part))
+            for part in items_field.split(','):
+                part = part.strip()
+                if part:
+                    yield ManifestItem(source_hint=source, url=part)
+
+
+def _column_index(header: List[str], *names: str) -> Optional[int]:
+    for name in names:
+        if name in header:
+            return header.index(name)
+    return None
 
 
 def execute_batch(
@@ -131,7 +348,20 @@ def execute_batch(
     dry_run: bool = False,
     logger: Optional[logging.Logger] = None,
     downloader: Optional[Downloader] = None,
+    max_workers: int = 1,
+    per_host_max: int = 2,
+    resume: bool = False,
 ) -> Dict[str, object]:
+    """Download every supported manifest item and return a summary dict.
+
+    With ``max_workers`` above one, downloads run on a thread pool and at most
+    ``per_host_max`` of them hit the same host at once. Limits are applied
+    while items are queued, so they behave the same in either mode.
+
+    Repeated URLs are skipped as duplicates. With ``resume``, URLs recorded in
+    ``out_dir/.completed`` by an earlier run are skipped and new successes are
+    appended to it.
+    """
     logger = logger or logging.getLogger('multidownloader.batch')
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -145,42 +375,74 @@ def execute_batch(
     skipped: List[Tuple[str, str, str]] = []
     errors: List[Tuple[str, str, str]] = []
 
-    for item in items:
-        handler = detect_handler(item.source_hint, item.url)
-        if not handler or handler not in SUPPORTED_SOURCES:
-            skipped.append((item.source_hint, item.url, 'unsupported'))
-            continue
+    seen = _read_completed_log(out_dir) if resume else set()
+    already_done = frozenset(seen)
+    done_log = (out_dir / COMPLETED_LOG_NAME).open('a', encoding='utf-8', buffering=1) if resume and not dry_run else None
+
+    def record(outcome):
+        handler, url, exc = outcome
+        if exc is None:
+            completed.append((handler, url))
+            if done_log is not None:
+                done_log.write(canonicalize_url(url) + '\n')
+        else:
+            errors.append((handler, url, str(exc)))
+
+    # decided once: skips LogRecord construction per item when INFO is filtered
+    log_progress = logger.info if logger.isEnabledFor(logging.INFO) else None
+    skip = skipped.append
+
+    pool = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 and not dry_run else None
+    dispatcher = HostDispatcher(pool.submit, max_workers, per_host_max) if pool is not None else None
+
+    try:
+        for item in items:
+            handler = detect_handler(item.source_hint, item.url)
+            opts = _HANDLER_OPTS.get(handler)
+            if opts is None:
+                skip((item.source_hint, item.url, 'unsupported'))
+                continue
 
-        if limit is not None and attempted >= limit:
-            skipped.append((item.source_hint, item.url, 'global-limit'))
-            continue
+            # cheapest check first: once the global budget is spent nothing else matters
+            if limit is not None and attempted >= limit:
+                skip((item.source_hint, item.url, 'global-limit'))
+                continue
 
-        used = counts.get(handler, 0)
-        if per_source_limit is not None and used >= per_source_limit:
-            skipped.append((item.source_hint, item.url, 'per-source-limit'))
-            continue
+            canon = canonicalize_url(item.url)
+            if canon in seen:
+                reason = 'already-completed' if canon in already_done else 'duplicate'
+                skip((item.source_hint, item.url, reason))
+                continue
 
-        counts[handler] = used + 1
-        attempted += 1
+            used = counts.get(handler, 0)
+            if per_source_limit is not None and used >= per_source_limit:
+                skip((item.source_hint, item.url, 'per-source-limit'))
+                continue
 
-        logger.info('Processing %s via %s', item.url, handler)
-        if dry_run:
-            completed.append((handler, item.url))
-            continue
+            seen.add(canon)
+            counts[handler] = used + 1
+            attempted += 1
 
-        opts = {}
-        if handler == 'Instagram':
-            opts['auth'] = 'auto'
-        elif handler != 'Google Drive':
-            # yt-dlp based handlers reuse session cookies when available
-            opts['use_session'] = True
+            if log_progress is not None:
+                log_progress('Processing %s via %s', item.url, handler)
+            if dry_run:
+                completed.append((handler, item.url))
+                continue
 
-        try:
-            downloader.download(handler, item.url, opts)
-            completed.append((handler, item.url))
-        except Exception as exc:  # pragma: no cover - delegates to handlers
-            logger.error('Download failed for %s (%s): %s', item.url, handler, exc)
-            errors.append((handler, item.url, str(exc)))
+            if dispatcher is None:
+                record(_download_one(downloader, handler, item.url, opts, logger))
+                continue
+            for future in dispatcher.add(host_of(item.url), _download_one, downloader, handler, item.url, opts, logger):
+                record(future.result())
+
+        if dispatcher is not None:
+            for future in dispatcher.drain():
+                record(future.result())
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if done_log is not None:
+            done_log.close()
 
     return {
         'attempted': attempted,
@@ -190,6 +452,24 @@ def execute_batch(
     }
 
 
+def _read_completed_log(out_dir: Path) -> set:
+    try:
+        with (out_dir / COMPLETED_LOG_NAME).open(encoding='utf-8') as fp:
+            return {line.rstrip('\n') for line in fp if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+def _download_one(downloader, handler: str, url: str, opts: Dict, logger: logging.Logger):
+    """Run one download; returns (handler, url, exc_or_None)."""
+    try:
+        downloader.download(handler, url, opts)
+    except Exception as exc:  # pragma: no cover - delegates to handlers
+        logger.error('Download failed for %s (%s): %s', url, handler, exc)
+        return handler, url, exc
+    return handler, url, None
+
+
 def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description='Download items listed by loot_report_scraper outputs.')
     parser.add_argument('input', type=Path, help='Path to grouped_by_source.json or grouped_by_source.csv')
@@ -197,6 +477,9 @@ def build_arg_parser() -> argparse.ArgumentParser:
     parser.add_argument('--out-dir', type=Path, default=DEFAULT_OUTPUT_DIR, help='Download destination directory')
     parser.add_argument('--limit', type=int, help='Maximum total items to attempt')
     parser.add_argument('--per-source-limit', type=int, help='Maximum items per source to attempt')
+    parser.add_argument('--max-concurrent', type=int, default=1, help='Number of downloads to run in parallel')
+    parser.add_argument('--per-host-max', type=int, default=2, help='Maximum parallel downloads against one host')
+    parser.add_argument('--resume', action='store_true', help='Skip URLs completed by a previous run into the same --out-dir')
     parser.add_argument('--dry-run', action='store_true', help='Only print actions without downloading')
     parser.add_argument('--verbose', action='store_true', help='Enable verbose logging')
     return parser
@@ -209,7 +492,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
     logger = logging.getLogger('multidownloader.batch')
 
-    manifest = load_manifest(args.input, fmt=args.format)
+    manifest = iter_manifest(args.input, fmt=args.format)
     result = execute_batch(
         manifest,
         args.out_dir,
@@ -217,6 +500,9 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         per_source_limit=args.per_source_limit,
         dry_run=args.dry_run,
         logger=logger,
+        max_workers=args.max_concurrent,
+        per_host_max=args.per_host_max,
+        resume=args.resume,
     )
 
     logger.info('Attempted: %s, completed: %s, skipped: %s, errors: %s', result['attempted'], len(result['completed']), len(result['skipped']), len(result['errors']))
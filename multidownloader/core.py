@@ -1,52 +1,80 @@
 """Core dispatcher for the multidownloader package.
 
 Provides a Downloader class that delegates to source-specific handlers.
+Handler modules are imported on first use so a run that only touches one
+source never pays for the optional dependencies of the others.
 """
-from .sources.facebook import FacebookHandler
-from .sources.gdrive import GoogleDriveHandler
-from .sources.instagram import InstagramHandler
-from .sources.reddit import RedditHandler
-from .sources.threads import ThreadsHandler
-from .sources.tiktok import TikTokHandler
-from .sources.twitter import TwitterHandler
-from .sources.youtube import YouTubeHandler
+import importlib
+import threading
+
+# source name -> (module under multidownloader.sources, handler class)
+HANDLER_REGISTRY = {
+    'Google Drive': ('gdrive', 'GoogleDriveHandler'),
+    'Instagram': ('instagram', 'InstagramHandler'),
+    'TikTok': ('tiktok', 'TikTokHandler'),
+    'Threads': ('threads', 'ThreadsHandler'),
+    'Twitter': ('twitter', 'TwitterHandler'),
+    'Reddit': ('reddit', 'RedditHandler'),
+    'Facebook': ('facebook', 'FacebookHandler'),
+    'YouTube': ('youtube', 'YouTubeHandler'),
+}
+
+
+def _handler_class(source_name):
+    if source_name not in HANDLER_REGISTRY:
+        raise ValueError(f'Unknown source: {source_name}')
+    module_name, class_name = HANDLER_REGISTRY[source_name]
+    module = importlib.import_module(f'.sources.{module_name}', __package__)
+    return getattr(module, class_name)
+
+
+def preload(source_name):
+    """Import a source's handler and its third-party library ahead of first use.
+
+    Safe to call from a background thread; unknown sources raise ValueError.
+    """
+    handler_cls = _handler_class(source_name)
+    warm = getattr(handler_cls, 'preload', None)
+    if warm is not None:
+        warm()
 
 
 class Downloader:
     def __init__(self, out_dir, logger=None):
         self.out_dir = out_dir
         self.logger = logger
-        self.handlers = {
-            'Google Drive': GoogleDriveHandler(logger=logger),
-            'Instagram': InstagramHandler(logger=logger),
-            'TikTok': TikTokHandler(logger=logger),
-            'Threads': ThreadsHandler(logger=logger),
-            'Twitter': TwitterHandler(logger=logger),
-            'Reddit': RedditHandler(logger=logger),
-            'Facebook': FacebookHandler(logger=logger),
-            'YouTube': YouTubeHandler(logger=logger),
-        }
+        self._handlers = {}
+        # batch runs may dispatch from several threads at once
+        self._handlers_lock = threading.Lock()
 
     def list_sources(self):
         """Return the list of supported source names."""
-        return list(self.handlers.keys())
+        return list(HANDLER_REGISTRY.keys())
+
+    def get_handler(self, source_name):
+        """Return the handler for a source, constructing it on first use."""
+        handler = self._handlers.get(source_name)
+        if handler is not None:
+            return handler
+        handler_cls = _handler_class(source_name)
+        with self._handlers_lock:
+            handler = self._handlers.get(source_name)
+            if handler is None:
+                handler = handler_cls(logger=self.logger)
+                self._handlers[source_name] = handler
+        return handler
 
     def download(self, source_name, url, options=None):
-        if source_name not in self.handlers:
-            raise ValueError(f'Unknown source: {source_name}')
-        handler = self.handlers[source_name]
+        handler = self.get_handler(source_name)
         return handler.download(url, self.out_dir, options or {})
 
     def authenticate(self, source_name, root=None):
         """Proxy to handler interactive authentication if available.
         Returns whatever the handler's auth method returns (e.g., Instaloader instance) or None.
         """
-        if source_name not in self.handlers:
-            raise ValueError(f'Unknown source: {source_name}')
-        handler = self.handlers[source_name]
+        handler = self.get_handler(source_name)
         # Prefer an interactive_auth method if present
         if hasattr(handler, 'interactive_auth'):
             return handler.interactive_auth(root=root)
         # No interactive auth available
         return None
-
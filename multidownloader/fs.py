@@ -0,0 +1,34 @@
+"""Filesystem helpers shared by the handlers."""
+from __future__ import annotations
+
+import os
+
+# directories this process has already created; set.add/discard are atomic
+# under the GIL, so concurrent handlers can share it without a lock
+_MKDIR_CACHE: set = set()
+
+
+def ensure_dir(path) -> str:
+    """Create ``path`` and its parents once per process; later calls are a set lookup.
+
+    A directory removed after the first call is not recreated here, so only
+    use this where the writer creates missing parents itself (yt-dlp, and
+    Instaloader's ``download_post``). gdown, PyDrive2 and plain ``open()``
+    do not; those callers use ``os.makedirs(..., exist_ok=True)`` instead.
+    """
+    key = os.fspath(path)
+    if key not in _MKDIR_CACHE:
+        os.makedirs(key, exist_ok=True)
+        _MKDIR_CACHE.add(key)
+    return key
+
+
+def invalidate(path=None):
+    """Forget one cached directory, or all of them when ``path`` is None."""
+    if path is None:
+        _MKDIR_CACHE.clear()
+    else:
+        _MKDIR_CACHE.discard(os.fspath(path))
+
+
+__all__ = ['ensure_dir', 'invalidate']
@@ -6,20 +6,37 @@ OAuth tokens) on disk without leaking them outside the local machine.
 """
 from __future__ import annotations
 
+import copy
+import functools
 import json
+import os
+import tempfile
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+try:  # optional C JSON codec; the stdlib json module is the fallback
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
 PACKAGE_ROOT = Path(__file__).resolve().parent
 SESSION_ROOT = PACKAGE_ROOT / '.sessions'
 
 
+# every non-alphanumeric ASCII character becomes '_'
+_ASCII_SANITIZE_TABLE = str.maketrans({chr(code): '_' for code in range(128) if not chr(code).isalnum()})
+
+
 def _sanitize(name: str) -> str:
-    cleaned = ''.join(ch.lower() if ch.isalnum() else '_' for ch in name)
+    if name.isascii():
+        cleaned = name.lower().translate(_ASCII_SANITIZE_TABLE)
+    else:
+        cleaned = ''.join(ch.lower() if ch.isalnum() else '_' for ch in name)
     cleaned = cleaned.strip('_') or 'default'
     return cleaned
 
 
+@functools.lru_cache(maxsize=32)
 def ensure_session_dir(source: str) -> Path:
     directory = SESSION_ROOT / _sanitize(source)
     directory.mkdir(parents=True, exist_ok=True)
@@ -31,51 +48,97 @@ def path_for(source: str, filename: str) -> Path:
     return directory / filename
 
 
+@functools.lru_cache(maxsize=16)
+def _load_json(path: Path, inode: int, mtime_ns: int, size: int):
+    # the stat fields only key the cache; atomic replaces always change the inode
+    with path.open('rb') as fp:
+        raw = fp.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
 def read_json(source: str, filename: str) -> Optional[Dict[str, Any]]:
     path = path_for(source, filename)
-    if not path.exists():
-        return None
     try:
-        with path.open('r', encoding='utf-8') as fp:
-            return json.load(fp)
-    except Exception:
+        st = path.stat()
+        data = _load_json(path, st.st_ino, st.st_mtime_ns, st.st_size)
+    except (OSError, ValueError):
         return None
+    # callers may mutate what they get back; keep the cached parse pristine
+    return copy.deepcopy(data)
+
+
+def _dump_json(data: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def _atomic_write(path: Path, data: bytes) -> Path:
+    """Write data to a sibling temp file and rename it over path.
+
+    Readers see either the old file or the complete new one, never a torn
+    write. The payload goes to the raw fd without Python-side buffering.
+    """
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    except FileNotFoundError:
+        # the session dir is memoised; recreate it if it was removed meanwhile
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        view = memoryview(data)
+        with view:
+            while view:
+                view = view[os.write(fd, view):]
+        os.close(fd)
+        fd = -1
+        os.replace(tmp_name, path)
+    except BaseException:
+        if fd != -1:
+            os.close(fd)
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    return path
 
 
 def write_json(source: str, filename: str, data: Dict[str, Any]):
     path = path_for(source, filename)
-    with path.open('w', encoding='utf-8') as fp:
-        json.dump(data, fp, indent=2)
-    return path
+    payload = _dump_json(data)
+    try:
+        if path.read_bytes() == payload:
+            return path  # unchanged; skip the rewrite
+    except OSError:
+        pass
+    return _atomic_write(path, payload)
 
 
 def write_binary(source: str, filename: str, data: bytes):
-    path = path_for(source, filename)
-    with path.open('wb') as fp:
-        fp.write(data)
-    return path
+    return _atomic_write(path_for(source, filename), data)
 
 
 def read_text(source: str, filename: str) -> Optional[str]:
     path = path_for(source, filename)
-    if not path.exists():
-        return None
     try:
         return path.read_text(encoding='utf-8')
-    except Exception:
+    except (OSError, ValueError):
         return None
 
 
 def write_text(source: str, filename: str, text: str):
-    path = path_for(source, filename)
-    path.write_text(text, encoding='utf-8')
-    return path
+    return _atomic_write(path_for(source, filename), text.encode('utf-8'))
 
 
 def list_files(source: str, suffix: Optional[str] = None):
     directory = ensure_session_dir(source)
     files = {}
-    for child in directory.iterdir():
+    try:
+        children = list(directory.iterdir())
+    except FileNotFoundError:  # removed since ensure_session_dir was memoised
+        return files
+    for child in children:
         if not child.is_file():
             continue
         if suffix and not child.name.endswith(suffix):
@@ -95,9 +158,10 @@ def default_metadata_path(source: str) -> Path:
 
 def load_default_session(source: str, *, filename: str = 'session.bin') -> Optional[bytes]:
     path = path_for(source, filename)
-    if not path.exists():
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
         return None
-    return path.read_bytes()
 
 
 def write_default_session(source: str, data: bytes, *, filename: str = 'session.bin'):
@@ -1,27 +1,18 @@
 """Google Drive handler (public via gdown, authenticated via PyDrive2)."""
 from __future__ import annotations
 
+import importlib.util
 import logging
 import os
 import re
+import threading
 from pathlib import Path
 from typing import Optional
 
-try:
-    import gdown
-    GDOWN_AVAILABLE = True
-except Exception:  # pragma: no cover - optional dependency
-    gdown = None
-    GDOWN_AVAILABLE = False
-
-try:
-    from pydrive2.auth import GoogleAuth
-    from pydrive2.drive import GoogleDrive
-    PYDRIVE2_AVAILABLE = True
-except Exception:  # pragma: no cover - optional dependency
-    GoogleAuth = None
-    GoogleDrive = None
-    PYDRIVE2_AVAILABLE = False
+# Both libraries drag in oauth2client/httplib2/google-auth, so only probe for
+# them here and import on first use.
+GDOWN_AVAILABLE = importlib.util.find_spec('gdown') is not None
+PYDRIVE2_AVAILABLE = importlib.util.find_spec('pydrive2') is not None
 
 from .. import session_store
 
@@ -35,17 +26,34 @@ CLIENT_SECRET_CANDIDATES = (
 )
 
 
+# one pass over the URL; the leftmost marker decides, so folderview?id= is a folder
+_DRIVE_ID_RE = re.compile(r"(?:folders/|folderview\?id=)(?P<folder>[\w-]+)|(?:/d/|id=)(?P<file>[\w-]+)")
+
+
 def parse_drive_id(url):
-    m = re.search(r"(?:/d/|id=)([\w-]+)", url)
-    if m:
-        return m.group(1), 'file'
-    m = re.search(r"(?:folders/|folderview\?id=)([\w-]+)", url)
-    if m:
-        return m.group(1), 'folder'
-    m = re.search(r"uc\?id=([\w-]+)", url)
-    if m:
-        return m.group(1), 'file'
-    return None, None
+    m = _DRIVE_ID_RE.search(url)
+    if not m:
+        return None, None
+    if m.group('file'):
+        return m.group('file'), 'file'
+    return m.group('folder'), 'folder'
+
+
+def _import_gdown():
+    try:
+        import gdown
+    except Exception as exc:  # pragma: no cover - broken install
+        raise RuntimeError(f'gdown not available: {exc}') from exc
+    return gdown
+
+
+def _import_pydrive2():
+    try:
+        from pydrive2.auth import GoogleAuth
+        from pydrive2.drive import GoogleDrive
+    except Exception as exc:  # pragma: no cover - broken install
+        raise RuntimeError(f'PyDrive2 not available: {exc}') from exc
+    return GoogleAuth, GoogleDrive
 
 
 def _find_client_secrets() -> Optional[Path]:
@@ -58,11 +66,23 @@ def _find_client_secrets() -> Optional[Path]:
 class GoogleDriveHandler:
     def __init__(self, logger=None):
         self.logger = logger or logging.getLogger(__name__)
+        # the OAuth flow and credential file are shared; batch workers take turns
+        self._auth_lock = threading.Lock()
+        # authorised client reused across a batch; refreshed only when expired
+        self._drive = None
         session_store.ensure_session_dir(SESSION_NAMESPACE)
 
+    @staticmethod
+    def preload():
+        """Import gdown now; PyDrive2 is only needed once the user signs in."""
+        if GDOWN_AVAILABLE:
+            _import_gdown()
+
     def download(self, url, out_dir, options):
         if not url or not isinstance(url, str):
             raise ValueError('A valid Google Drive URL must be provided')
+        # not fs.ensure_dir: gdown and PyDrive2 don't create a folder the
+        # user deleted since the last download
         os.makedirs(out_dir, exist_ok=True)
         fid, typ = parse_drive_id(url)
         if not fid:
@@ -79,11 +99,15 @@ class GoogleDriveHandler:
     def _download_public_file(self, url: str, out_dir: str):
         if not GDOWN_AVAILABLE:
             raise RuntimeError('gdown not available')
+        gdown = _import_gdown()
         self.logger.info('Downloading public drive file: %s -> %s', url, out_dir)
         try:
             # fuzzy lets gdown pull the file id out of any drive URL shape,
-            # including the common /file/d/<id>/view share links
-            gdown.download(url, output=os.path.join(out_dir, ''), quiet=False, fuzzy=True)
+            # including the common /file/d/<id>/view share links; the trailing
+            # separator makes gdown treat output as a directory and keep the
+            # remote file name
+            output = f'{Path(out_dir)}{os.sep}'
+            gdown.download(url, output=output, quiet=False, fuzzy=True)
             return True
         except Exception as exc:  # pragma: no cover - network call
             raise RuntimeError(f'gdown failed: {exc}')
@@ -91,7 +115,8 @@ class GoogleDriveHandler:
     def _download_authenticated_file(self, file_id: str, out_dir: str):
         if not PYDRIVE2_AVAILABLE:
             raise RuntimeError('PyDrive2 not available')
-        drive = self._get_drive_client()
+        with self._auth_lock:
+            drive = self._get_drive_client()
         file_obj = drive.CreateFile({'id': file_id})
         file_obj.FetchMetadata()
         name = file_obj.get('title') or file_obj.get('originalFilename') or file_id
@@ -111,6 +136,7 @@ class GoogleDriveHandler:
     def _download_folder(self, folder_id: str, out_dir: str):
         if not GDOWN_AVAILABLE:
             raise RuntimeError('gdown not available for folders')
+        gdown = _import_gdown()
         url = f'https://drive.google.com/drive/folders/{folder_id}'
         self.logger.info('Downloading Google Drive folder: %s -> %s', folder_id, out_dir)
         try:
@@ -123,6 +149,17 @@ class GoogleDriveHandler:
         if not PYDRIVE2_AVAILABLE:
             raise RuntimeError('PyDrive2 not available')
 
+        if self._drive is not None:
+            cached_auth = self._drive.auth
+            try:
+                if cached_auth.access_token_expired:
+                    cached_auth.Refresh()
+                    self.logger.info('Refreshed Google Drive token')
+                return self._drive
+            except Exception as exc:  # pragma: no cover - revoked refresh token
+                self.logger.warning('Cached Google Drive client could not refresh: %s', exc)
+                self._drive = None
+
         client_secrets = _find_client_secrets()
         if not client_secrets:
             raise RuntimeError(
@@ -130,6 +167,7 @@ class GoogleDriveHandler:
                 f'{CLIENT_SECRET_CANDIDATES[0]} or {CLIENT_SECRET_CANDIDATES[1]}'
             )
 
+        GoogleAuth, GoogleDrive = _import_pydrive2()
         gauth = GoogleAuth()
         try:
             gauth.LoadClientConfigFile(str(client_secrets))
@@ -151,7 +189,8 @@ class GoogleDriveHandler:
                     self.logger.info('Refreshed Google Drive token')
                 else:
                     gauth.Authorize()
-                return GoogleDrive(gauth)
+                self._drive = GoogleDrive(gauth)
+                return self._drive
             except Exception as exc:  # pragma: no cover - expired refresh token
                 self.logger.warning('Stored Google Drive credentials invalid: %s', exc)
 
@@ -163,7 +202,8 @@ class GoogleDriveHandler:
             self.logger.info('Saved Google Drive credentials to %s', credentials_path)
         except Exception as exc:  # pragma: no cover - disk issues
             self.logger.warning('Failed to persist Google Drive credentials: %s', exc)
-        return GoogleDrive(gauth)
+        self._drive = GoogleDrive(gauth)
+        return self._drive
 
 
 __all__ = ['GoogleDriveHandler', 'parse_drive_id']
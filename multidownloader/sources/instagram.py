@@ -1,24 +1,39 @@
 """Instagram handler using Instaloader with local session persistence."""
 from __future__ import annotations
 
+import functools
+import importlib.util
 import logging
 import os
+import random
 import re
 import shutil
+import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+from types import SimpleNamespace
 
-try:
-    from instaloader import Instaloader, Post
-    INSTALOADER_AVAILABLE = True
-except Exception:  # pragma: no cover - instaloader optional
-    Instaloader = None
-    Post = None
-    INSTALOADER_AVAILABLE = False
+# Instaloader and Tk are imported on first use: batch runs never open a
+# dialog, and yt-dlp-only runs never touch Instaloader.
+INSTALOADER_AVAILABLE = importlib.util.find_spec('instaloader') is not None
 
 from .. import session_store
+from ..fs import ensure_dir
+
+_SHORTCODE_RE = re.compile(r"instagram\.com/(?:p|reel|tv)/([\w-]+)")
+# parallel fetches for carousel items; the CDN handles this comfortably
+_SIDECAR_WORKERS = 8
+
+
+@functools.lru_cache(maxsize=1)
+def _import_instaloader():
+    try:
+        from instaloader import Instaloader, Post
+    except Exception as exc:  # pragma: no cover - broken install
+        raise RuntimeError(f'Instaloader not available: {exc}') from exc
+    return Instaloader, Post
 
 
 class InstagramHandler:
@@ -27,12 +42,30 @@ class InstagramHandler:
 
     def __init__(self, logger=None):
         self.logger = logger or logging.getLogger(__name__)
+        # built loaders keyed 'session'/'anonymous'; reusing them keeps the
+        # parsed session and its keep-alive connections across downloads
+        self._loaders = {}
+        self._loader_lock = threading.Lock()
+        # InstaloaderContext (rate controller, session) has no locking, so
+        # downloads sharing a loader take turns on it
+        self._use_locks = weakref.WeakKeyDictionary()
+        self._auth_dialog = None
+        self._twofa_dialog = None
         session_store.ensure_session_dir(self.SESSION_SOURCE)
 
+    @staticmethod
+    def preload():
+        """Import Instaloader now so the first download doesn't pay for it."""
+        if INSTALOADER_AVAILABLE:
+            _import_instaloader()
+
     # ------------------------------------------------------------------
     # Interactive authentication helpers
     def interactive_auth(self, root=None):
         """Open a Tk dialog to authenticate or load a saved session."""
+        import tkinter as tk
+        from tkinter import filedialog, messagebox
+
         if not INSTALOADER_AVAILABLE:
             messagebox.showerror('Missing Dependency', 'Instaloader is required for Instagram authenticated downloads')
             self.logger.error('Instaloader not available for Instagram authentication')
@@ -50,46 +83,14 @@ class InstagramHandler:
                 self.logger.warning('Failed to use cached session automatically: %s', exc)
 
         parent = root or tk._default_root
-        dlg = tk.Toplevel(parent)
-        dlg.title('Instagram Login')
-        frm = ttk.Frame(dlg, padding=16)
-        frm.pack(fill=tk.BOTH, expand=True)
-
-        ttk.Label(frm, text='Username:').grid(row=0, column=0, sticky='e', padx=(0, 8), pady=4)
-        user_entry = ttk.Entry(frm)
-        user_entry.grid(row=0, column=1, sticky='ew', pady=4)
+        dlg = self._login_dialog(parent)
+        dlg.user_entry.delete(0, tk.END)
         if cached_user:
-            user_entry.insert(0, cached_user)
-
-        ttk.Label(frm, text='Password (leave blank to use session file):').grid(row=1, column=0, sticky='e', padx=(0, 8), pady=4)
-        pwd_entry = ttk.Entry(frm, show='*')
-        pwd_entry.grid(row=1, column=1, sticky='ew', pady=4)
-        frm.columnconfigure(1, weight=1)
-
-        sess_var = tk.StringVar(value=str(cached_path) if cached_path else '')
-
-        def pick_session():
-            path = filedialog.askopenfilename(title='Select Instaloader session file')
-            if path:
-                sess_var.set(path)
-                self.logger.info('Selected Instagram session file: %s', path)
-
-        ttk.Button(frm, text='Select Session File', command=pick_session).grid(row=2, column=0, columnspan=2, pady=4)
-        ttk.Label(frm, textvariable=sess_var, anchor='w').grid(row=3, column=0, columnspan=2, sticky='w', pady=2)
-
-        res = {}
-
-        def submit():
-            res['username'] = user_entry.get().strip()
-            res['password'] = pwd_entry.get()
-            res['session_path'] = sess_var.get().strip()
-            dlg.destroy()
-
-        ttk.Button(frm, text='Continue', command=submit).grid(row=4, column=0, columnspan=2, pady=(12, 4))
-
-        frm.pack_propagate(False)
-        dlg.grab_set()
-        parent.wait_window(dlg)
+            dlg.user_entry.insert(0, cached_user)
+        dlg.pwd_entry.delete(0, tk.END)
+        dlg.sess_var.set(str(cached_path) if cached_path else '')
+        res = self._run_dialog(dlg)
+        dlg.pwd_entry.delete(0, tk.END)
 
         username = res.get('username') or ''
         password = res.get('password') or ''
@@ -100,12 +101,14 @@ class InstagramHandler:
             self.logger.error('Username missing for Instagram session reuse')
             return None
 
+        Instaloader, _ = _import_instaloader()
         loader = Instaloader()
         try:
             if session_path and username:
                 self.logger.info('Loading Instagram session for %s from %s', username, session_path)
                 loader.load_session_from_file(username, session_path)
                 self._remember_external_session(username, Path(session_path))
+                self._loaders['session'] = loader
                 return loader
 
             if username and password:
@@ -127,6 +130,7 @@ class InstagramHandler:
                         raise
 
                 self._remember_loader_session(loader, username)
+                self._loaders['session'] = loader
                 # Offer optional export for the user
                 save_to = filedialog.asksaveasfilename(title='Save session copy (optional)', defaultextension='.session')
                 if save_to:
@@ -149,72 +153,220 @@ class InstagramHandler:
         if not INSTALOADER_AVAILABLE:
             raise RuntimeError('Instaloader not available')
 
+        _, Post = _import_instaloader()
         auth_mode = options.get('auth', 'auto')
         loader = options.get('instaloader_client') or options.get('instaloader')
         loader = self._ensure_loader(loader, auth_mode)
 
-        os.makedirs(out_dir, exist_ok=True)
+        ensure_dir(out_dir)
         url_clean = url.split('?')[0]
-        match = re.search(r"instagram.com/(?:p|reel|tv)/([\w-]+)", url_clean)
+        match = _SHORTCODE_RE.search(url_clean)
         if not match:
             raise ValueError('Invalid Instagram link')
         shortcode = match.group(1)
 
-        cwd = os.getcwd()
-        try:
-            os.chdir(out_dir)
-            attempts = 2
-            for attempt in range(1, attempts + 1):
-                try:
+        # a Path target is used verbatim by the default '{target}' dirname
+        # pattern, so no process-wide chdir is needed and loaders can be shared
+        target = Path(out_dir) / shortcode
+        attempts = 3
+        for attempt in range(1, attempts + 1):
+            try:
+                with self._use_lock(loader):
                     post = Post.from_shortcode(loader.context, shortcode)
-                    loader.download_post(post, target=shortcode)
-                    self.logger.info('Downloaded Instagram post: %s', shortcode)
-                    return True
+                    self._prefetch_sidecar(loader, post, target)
+                    loader.download_post(post, target=target)
+                self.logger.info('Downloaded Instagram post: %s', shortcode)
+                return True
+            except Exception as exc:
+                message = str(exc)
+                self.logger.warning('Attempt %s failed for %s: %s', attempt, shortcode, message)
+                if 'login' in message.lower() or 'authenticate' in message.lower():
+                    self._forget_loader(loader)
+                    raise RuntimeError('Instagram requires authentication for this post. Authenticate via the UI first.')
+                if attempt < attempts:
+                    # exponential backoff with jitter lets 429 windows clear
+                    time.sleep(min(30, 2 ** (attempt - 1) + random.uniform(0, 0.5)))
+                    continue
+                raise RuntimeError(f'Failed to download Instagram post {shortcode}: {message}')
+
+    def _prefetch_sidecar(self, loader, post, target: Path):
+        """Fetch carousel media in parallel ahead of ``download_post``.
+
+        ``download_post`` walks sidecar nodes one GET at a time but skips
+        files that already exist, so afterwards it only writes the caption
+        and metadata. The file names mirror the ones it would choose.
+        """
+        if post.typename != 'GraphSidecar' or post.mediacount < 2:
+            return
+        if loader.dirname_pattern != '{target}' or '{filename}' in loader.filename_pattern:
+            return  # names we don't reproduce; leave it all to download_post
+
+        template = str(target / loader.format_filename(post, target=target))
+        jobs = []
+        start = loader.slide_start % post.mediacount + 1
+        for index, node in enumerate(post.get_sidecar_nodes(loader.slide_start, loader.slide_end), start=start):
+            video_url = node.video_url
+            if loader.download_pictures and (video_url is None or loader.download_video_thumbnails):
+                jobs.append((node.display_url, str(index)))
+            if video_url is not None and loader.download_videos:
+                jobs.append((video_url, str(index)))
+        if len(jobs) < 2:
+            return
+
+        # download_pic writes straight into target; one new folder per post
+        os.makedirs(target, exist_ok=True)
+        workers = min(_SIDECAR_WORKERS, len(jobs))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='instagram-sidecar') as pool:
+            futures = [
+                pool.submit(loader.download_pic, template, url, post.date_local, filename_suffix=suffix)
+                for url, suffix in jobs
+            ]
+            for future in as_completed(futures):
+                try:
+                    future.result()
                 except Exception as exc:
-                    message = str(exc)
-                    self.logger.warning('Attempt %s failed for %s: %s', attempt, shortcode, message)
-                    if 'login' in message.lower() or 'authenticate' in message.lower():
-                        raise RuntimeError('Instagram requires authentication for this post. Authenticate via the UI first.')
-                    if attempt < attempts:
-                        time.sleep(1)
-                        continue
-                    raise RuntimeError(f'Failed to download Instagram post {shortcode}: {message}')
-        finally:
-            os.chdir(cwd)
+                    # download_post fetches whatever is still missing
+                    self.logger.debug('Sidecar prefetch failed for %s: %s', post.shortcode, exc)
 
     # ------------------------------------------------------------------
     def _prompt_2fa(self, parent):
         """Prompt for a 2FA code."""
-        dlg = tk.Toplevel(parent)
-        dlg.title('Instagram 2FA')
-        ttk.Label(dlg, text='Enter 2FA code:').pack(padx=16, pady=(16, 4))
-        code_var = tk.StringVar()
-        entry = ttk.Entry(dlg, textvariable=code_var)
-        entry.pack(padx=16, pady=4)
-        entry.focus_set()
-        result = {'code': None}
+        import tkinter as tk
+        from tkinter import ttk
+
+        dlg = self._twofa_dialog
+        if dlg is None or not self._dialog_alive(dlg):
+            dlg = self._twofa_dialog = self._build_dialog(parent, 'Instagram 2FA')
+            ttk.Label(dlg.window, text='Enter 2FA code:').pack(padx=16, pady=(16, 4))
+            dlg.code_var = tk.StringVar(dlg.window)
+            dlg.entry = ttk.Entry(dlg.window, textvariable=dlg.code_var)
+            dlg.entry.pack(padx=16, pady=4)
+
+            def submit():
+                dlg.result['code'] = dlg.code_var.get().strip()
+                dlg.done.set(True)
+
+            ttk.Button(dlg.window, text='Submit', command=submit).pack(pady=(8, 16))
+
+        dlg.code_var.set('')
+        dlg.entry.focus_set()
+        return self._run_dialog(dlg).get('code')
+
+    # Dialogs are built once, hidden with withdraw() between uses and shown
+    # again with deiconify(); rebuilding the widget tree costs a burst of Tcl
+    # round trips every time a login is retried.
+    def _build_dialog(self, parent, title):
+        import tkinter as tk
+
+        window = tk.Toplevel(parent)
+        window.withdraw()
+        window.title(title)
+        dlg = SimpleNamespace(window=window, done=tk.BooleanVar(window), result={})
+        # closing the window counts as cancelling: the result stays empty
+        window.protocol('WM_DELETE_WINDOW', lambda: dlg.done.set(False))
+        return dlg
+
+    def _login_dialog(self, parent):
+        import tkinter as tk
+        from tkinter import filedialog, ttk
+
+        dlg = self._auth_dialog
+        if dlg is not None and self._dialog_alive(dlg):
+            return dlg
+
+        dlg = self._auth_dialog = self._build_dialog(parent, 'Instagram Login')
+        frm = ttk.Frame(dlg.window, padding=16)
+        frm.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(frm, text='Username:').grid(row=0, column=0, sticky='e', padx=(0, 8), pady=4)
+        dlg.user_entry = ttk.Entry(frm)
+        dlg.user_entry.grid(row=0, column=1, sticky='ew', pady=4)
+
+        ttk.Label(frm, text='Password (leave blank to use session file):').grid(row=1, column=0, sticky='e', padx=(0, 8), pady=4)
+        dlg.pwd_entry = ttk.Entry(frm, show='*')
+        dlg.pwd_entry.grid(row=1, column=1, sticky='ew', pady=4)
+        frm.columnconfigure(1, weight=1)
+
+        dlg.sess_var = tk.StringVar(dlg.window)
+
+        def pick_session():
+            path = filedialog.askopenfilename(title='Select Instaloader session file')
+            if path:
+                dlg.sess_var.set(path)
+                self.logger.info('Selected Instagram session file: %s', path)
+
+        ttk.Button(frm, text='Select Session File', command=pick_session).grid(row=2, column=0, columnspan=2, pady=4)
+        ttk.Label(frm, textvariable=dlg.sess_var, anchor='w').grid(row=3, column=0, columnspan=2, sticky='w', pady=2)
 
         def submit():
-            result['code'] = code_var.get().strip()
-            dlg.destroy()
+            dlg.result['username'] = dlg.user_entry.get().strip()
+            dlg.result['password'] = dlg.pwd_entry.get()
+            dlg.result['session_path'] = dlg.sess_var.get().strip()
+            dlg.done.set(True)
 
-        ttk.Button(dlg, text='Submit', command=submit).pack(pady=(8, 16))
-        dlg.grab_set()
-        parent.wait_window(dlg)
-        return result['code']
+        ttk.Button(frm, text='Continue', command=submit).grid(row=4, column=0, columnspan=2, pady=(12, 4))
+
+        frm.pack_propagate(False)
+        return dlg
+
+    @staticmethod
+    def _run_dialog(dlg):
+        """Show a prepared dialog modally and return what its submit handler stored."""
+        dlg.result.clear()
+        dlg.window.deiconify()
+        dlg.window.grab_set()
+        try:
+            dlg.window.wait_variable(dlg.done)
+        finally:
+            dlg.window.grab_release()
+            dlg.window.withdraw()
+        # hand back a copy; the password must not linger on the handler
+        result = dict(dlg.result)
+        dlg.result.clear()
+        return result
+
+    @staticmethod
+    def _dialog_alive(dlg):
+        import tkinter as tk
+
+        try:
+            return bool(dlg.window.winfo_exists())
+        except tk.TclError:  # parent root was destroyed
+            return False
 
     def _ensure_loader(self, loader, auth_mode: str):
         if loader:
             return loader
 
-        if auth_mode in ('auto', 'authenticated'):
-            cached = self._load_cached_client()
-            if cached:
-                return cached
-            if auth_mode == 'authenticated':
-                raise RuntimeError('No saved Instagram session found. Run Instagram authentication first.')
-
-        return Instaloader()
+        with self._loader_lock:
+            if auth_mode in ('auto', 'authenticated'):
+                cached = self._loaders.get('session') or self._load_cached_client()
+                if cached:
+                    self._loaders['session'] = cached
+                    return cached
+                if auth_mode == 'authenticated':
+                    raise RuntimeError('No saved Instagram session found. Run Instagram authentication first.')
+
+            anonymous = self._loaders.get('anonymous')
+            if anonymous is None:
+                Instaloader, _ = _import_instaloader()
+                anonymous = self._loaders['anonymous'] = Instaloader()
+            return anonymous
+
+    def _use_lock(self, loader):
+        """Lock serialising downloads on ``loader``, cached or passed in by the caller."""
+        with self._loader_lock:
+            lock = self._use_locks.get(loader)
+            if lock is None:
+                lock = self._use_locks[loader] = threading.Lock()
+            return lock
+
+    def _forget_loader(self, loader):
+        """Drop a cached loader whose session was rejected so the next call rebuilds it."""
+        with self._loader_lock:
+            for key, cached in list(self._loaders.items()):
+                if cached is loader:
+                    del self._loaders[key]
 
     def _cached_session_info(self):
         meta = session_store.read_json(self.SESSION_SOURCE, self.META_FILENAME) or {}
@@ -226,6 +378,7 @@ class InstagramHandler:
     def _load_cached_client(self):
         username, session_path = self._cached_session_info()
         if username and session_path and session_path.exists():
+            Instaloader, _ = _import_instaloader()
             loader = Instaloader()
             loader.load_session_from_file(username, session_path)
             return loader
@@ -246,7 +399,9 @@ class InstagramHandler:
     def _remember_external_session(self, username: str, source_path: Path):
         try:
             dest = session_store.path_for(self.SESSION_SOURCE, source_path.name)
-            shutil.copy2(source_path, dest)
+            # contents only: the kernel copies it (sendfile), and the source
+            # mtime/mode mean nothing for the cached copy
+            shutil.copyfile(source_path, dest)
             session_store.write_json(self.SESSION_SOURCE, self.META_FILENAME, {
                 'username': username,
                 'filename': dest.name,
@@ -1,10 +1,13 @@
 """TikTok handler using yt-dlp."""
 from __future__ import annotations
 
-from .yt_dlp_base import YtDlpHandler
+from .yt_dlp_base import YtDlpHandler, impersonate_opts
 
 
 class TikTokHandler(YtDlpHandler):
     def __init__(self, logger=None):
         super().__init__('TikTok', logger=logger, outtmpl='%(uploader)s/%(title)s [%(id)s].%(ext)s')
 
+    def extra_yt_opts(self, options):
+        # TikTok gates on TLS fingerprint and serves HTTP/2 to browser clients
+        return impersonate_opts()
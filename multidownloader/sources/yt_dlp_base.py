@@ -1,26 +1,118 @@
 """Shared yt-dlp handler utilities."""
 from __future__ import annotations
 
+import atexit
+import functools
+import importlib.util
 import logging
 import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
-try:  # modern yt-dlp versions keep DownloadError in utils but may drop helpers
-    import yt_dlp
-    from yt_dlp.utils import DownloadError
+# yt-dlp imports hundreds of extractor modules; probe here, import on first download
+YTDLP_AVAILABLE = importlib.util.find_spec('yt_dlp') is not None
+
+from .. import session_store
+from ..fs import ensure_dir
+
+# probed once; shutil.which walks every PATH entry
+_HAS_ARIA2 = bool(shutil.which('aria2c'))
+# yt-dlp's impersonation request handler is backed by curl_cffi
+_HAS_CURL_CFFI = importlib.util.find_spec('curl_cffi') is not None
+
+
+@functools.lru_cache(maxsize=1)
+def _import_yt_dlp():
+    """Return ``(yt_dlp, DownloadError, save_cookies_to_file)``, importing on first call."""
+    try:  # modern yt-dlp versions keep DownloadError in utils but may drop helpers
+        import yt_dlp
+        from yt_dlp.utils import DownloadError
+    except Exception as exc:  # pragma: no cover - broken install
+        raise RuntimeError(f'yt-dlp not available: {exc}') from exc
     try:
         from yt_dlp.utils import save_cookies_to_file  # optional helper (removed in some builds)
     except Exception:  # pragma: no cover - helper is optional
         save_cookies_to_file = None
-    YTDLP_AVAILABLE = True
-except Exception:  # pragma: no cover - module might be missing in minimal envs
-    yt_dlp = None
-    DownloadError = Exception
-    save_cookies_to_file = None
-    YTDLP_AVAILABLE = False
+    return yt_dlp, DownloadError, save_cookies_to_file
 
-from .. import session_store
+
+_TMPFS_ROOT = '/dev/shm'
+# staging is skipped when the tmpfs has less than this free
+_STAGE_MIN_FREE = 1024 ** 3
+
+
+@functools.lru_cache(maxsize=1)
+def _staging_dir() -> Optional[str]:
+    """Per-process scratch dir on tmpfs for yt-dlp's .part/fragment files, or None."""
+    if not os.access(_TMPFS_ROOT, os.W_OK):
+        return None
+    path = tempfile.mkdtemp(prefix='multidownloader-', dir=_TMPFS_ROOT)
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return path
+
+
+@functools.lru_cache(maxsize=64)
+def _join_outtmpl(out_dir: str, outtmpl: str) -> str:
+    # batches reuse a handful of (out_dir, template) pairs
+    return os.path.join(out_dir, outtmpl)
+
+
+# yt-dlp retry_sleep_functions: seconds to wait before retry n (0-based)
+def _http_backoff(n: int) -> float:
+    return min(30, 2 ** n)
+
+
+def _fragment_backoff(n: int) -> float:
+    return min(10, 2 ** n)
+
+
+def _cookie_state(jar) -> frozenset:
+    """Comparable snapshot of a cookie jar's contents."""
+    return frozenset((c.domain, c.path, c.name, c.value, c.expires) for c in jar)
+
+
+def impersonate_opts() -> Dict:
+    """Options that make yt-dlp present a Chrome TLS/HTTP2 fingerprint.
+
+    Empty unless curl_cffi is installed; yt-dlp refuses to start when asked
+    for a target it has no handler for.
+    """
+    if not _HAS_CURL_CFFI:
+        return {}
+    try:
+        from yt_dlp.networking.impersonate import ImpersonateTarget
+    except Exception:  # pragma: no cover - yt-dlp predating impersonation
+        return {}
+    return {'impersonate': ImpersonateTarget('chrome')}
+
+
+class _YtDlpLogger:
+    """yt-dlp ``logger`` hook that drops chatter and forwards only errors.
+
+    With a logger set yt-dlp hands over each message as-is, so suppressed
+    progress and info lines cost one no-op call instead of console writes.
+    """
+
+    __slots__ = ('_real',)
+
+    def __init__(self, real: logging.Logger):
+        self._real = real
+
+    def debug(self, msg):
+        pass
+
+    def info(self, msg):
+        pass
+
+    def warning(self, msg):
+        pass
+
+    def error(self, msg):
+        self._real.error(msg)
 
 
 class YtDlpHandler:
@@ -33,8 +125,16 @@ class YtDlpHandler:
         self.source_key = source_key
         self.logger = logger or logging.getLogger(f'multidownloader.{source_key.lower()}')
         self.outtmpl = outtmpl or '%(title)s [%(id)s].%(ext)s'
+        # concurrent downloads share one cookies.txt; serialise the rewrites
+        self._cookie_lock = threading.Lock()
         session_store.ensure_session_dir(self.source_key)
 
+    @staticmethod
+    def preload():
+        """Import yt-dlp now so the first download doesn't pay for it."""
+        if YTDLP_AVAILABLE:
+            _import_yt_dlp()
+
     # --- hooks for subclasses -------------------------------------------------
     def extra_yt_opts(self, options: Dict) -> Dict:
         """Subclasses can override to provide additional yt-dlp options."""
@@ -42,49 +142,132 @@ class YtDlpHandler:
 
     # --- public API ----------------------------------------------------------
     def download(self, url: str, out_dir: str, options: Optional[Dict] = None):
-        if not YTDLP_AVAILABLE:
-            raise RuntimeError('yt-dlp not available - install it to use this handler')
+        options = options or {}
+        ensure_dir(out_dir)
 
+        failures = self._download_urls([url], out_dir, options)
+        if failures:
+            _, exc = failures[0]
+            raise RuntimeError(f'yt-dlp failed for {self.source_key}: {exc}') from exc
+        return True
+
+    def download_many(self, urls: Iterable[str], out_dir: str, options: Optional[Dict] = None, *, max_workers: Optional[int] = None):
+        """Download several URLs in parallel, splitting them across worker threads.
+
+        Each worker reuses one YoutubeDL for its share and saves cookies once at
+        the end. Every URL is attempted; the first failure is raised afterwards.
+        """
+        urls = list(urls)
+        if not urls:
+            return True
         options = options or {}
-        os.makedirs(out_dir, exist_ok=True)
+        ensure_dir(out_dir)
 
+        # network bound, so size past the core count
+        workers = max_workers or min(len(urls), (os.cpu_count() or 1) * 4, 16)
+        shares = [urls[i::workers] for i in range(min(workers, len(urls)))]
+        # options are the same for every share; resolve them once
+        prepared = self._prepare(out_dir, options)
+        failures = []
+        with ThreadPoolExecutor(max_workers=len(shares), thread_name_prefix=f'yt-dlp-{self.source_key}') as pool:
+            futures = [pool.submit(self._download_urls, share, out_dir, options, prepared) for share in shares]
+            for future in as_completed(futures):
+                failures.extend(future.result())
+        for url, exc in failures:
+            self.logger.error('yt-dlp download failed for %s: %s', url, exc)
+        if failures:
+            _, exc = failures[0]
+            raise RuntimeError(f'yt-dlp failed for {self.source_key}: {exc}') from exc
+        return True
+
+    # --- internal helpers ----------------------------------------------------
+    def _prepare(self, out_dir: str, options: Dict):
         cookie_path = self._resolve_cookie_path(options)
-        ydl_opts = self._build_opts(out_dir, options, cookie_path)
+        return cookie_path, self._build_opts(out_dir, options)
 
-        self.logger.info('yt-dlp download start: source=%s url=%s', self.source_key, url)
+    def _download_urls(self, urls, out_dir: str, options: Dict, prepared=None):
+        """Download ``urls`` in order on one YoutubeDL; return ``(url, exc)`` per failure."""
+        if not YTDLP_AVAILABLE:
+            raise RuntimeError('yt-dlp not available - install it to use this handler')
+        yt_dlp, DownloadError, _ = _import_yt_dlp()
+
+        cookie_path, ydl_opts = prepared or self._prepare(out_dir, options)
 
-        try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
-                self.logger.info('yt-dlp download complete: %s', url)
-                if cookie_path:
+        failures = []
+        # YoutubeDL keeps and mutates its params dict; give each instance its own
+        with yt_dlp.YoutubeDL(dict(ydl_opts)) as ydl:
+            loaded = self._load_cookies(ydl, cookie_path) if cookie_path else None
+            try:
+                for url in urls:
+                    self.logger.info('yt-dlp download start: source=%s url=%s', self.source_key, url)
+                    try:
+                        ydl.download([url])
+                    except DownloadError as exc:
+                        failures.append((url, exc))
+                        continue
+                    self.logger.info('yt-dlp download complete: %s', url)
+            finally:
+                # only rewrite the jar when a download changed it; a failed or
+                # cookie-less run must not leave an empty cookies.txt behind
+                if cookie_path and _cookie_state(ydl.cookiejar) != loaded:
                     try:
-                        if save_cookies_to_file:
-                            save_cookies_to_file(ydl.cookiejar, str(cookie_path), ignore_discard=True, ignore_expires=True)
-                        else:
-                            # newer yt-dlp builds drop the helper; the jar can save itself
-                            ydl.cookiejar.save(str(cookie_path), ignore_discard=True, ignore_expires=True)
-                        self.logger.debug('Updated cookies saved to %s', cookie_path)
+                        self._save_cookies(ydl, cookie_path)
                     except Exception as exc:  # pragma: no cover - best effort
                         self.logger.warning('Failed to persist cookies for %s: %s', self.source_key, exc)
-        except DownloadError as exc:
-            raise RuntimeError(f'yt-dlp failed for {self.source_key}: {exc}') from exc
+        return failures
 
-        return True
+    def _load_cookies(self, ydl, cookie_path: Path) -> frozenset:
+        """Fill ydl's jar from ``cookie_path`` if it exists; return the loaded state.
 
-    # --- internal helpers ----------------------------------------------------
-    def _build_opts(self, out_dir: str, options: Dict, cookie_path: Optional[Path]) -> Dict:
+        The jar is loaded here instead of through yt-dlp's 'cookiefile'
+        option, which would make YoutubeDL.close() rewrite the file on every
+        run whether or not anything changed.
+        """
+        with self._cookie_lock:
+            if cookie_path.is_file():
+                ydl.cookiejar.load(str(cookie_path), ignore_discard=True, ignore_expires=True)
+        return _cookie_state(ydl.cookiejar)
+
+    def _save_cookies(self, ydl, cookie_path: Path):
+        save_cookies_to_file = _import_yt_dlp()[2]
+        with self._cookie_lock:
+            if save_cookies_to_file:
+                save_cookies_to_file(ydl.cookiejar, str(cookie_path), ignore_discard=True, ignore_expires=True)
+            else:
+                # newer yt-dlp builds drop the helper; the jar can save itself
+                ydl.cookiejar.save(str(cookie_path), ignore_discard=True, ignore_expires=True)
+        self.logger.debug('Updated cookies saved to %s', cookie_path)
+
+    def _build_opts(self, out_dir: str, options: Dict) -> Dict:
         base_opts: Dict = {
-            'outtmpl': os.path.join(out_dir, self.outtmpl),
+            'outtmpl': _join_outtmpl(out_dir, self.outtmpl),
             'noplaylist': True,
             'quiet': True,
             'no_warnings': True,
-            'retries': 2,
-            'concurrent_fragment_downloads': 2,
+            'noprogress': True,
+            'logger': _YtDlpLogger(self.logger),
+            'retries': 5,
+            'fragment_retries': 5,
+            'retry_sleep_functions': {'http': _http_backoff, 'fragment': _fragment_backoff},
+            # HLS/DASH fragments are fetched in parallel; plain HTTP in 10 MiB ranges
+            # UI option builders may pass fragments=None; treat it as the default
+            'concurrent_fragment_downloads': max(1, min(16, int(options.get('fragments') or 8))),
+            'http_chunk_size': 10 * 1024 * 1024,
         }
 
-        if cookie_path:
-            base_opts['cookiefile'] = str(cookie_path)
+        if options.get('stage_tmpfs'):
+            stage = _staging_dir()
+            if stage and shutil.disk_usage(stage).free >= _STAGE_MIN_FREE:
+                # yt-dlp keeps .part/fragment churn under 'temp' and moves the
+                # finished file into 'home': one sequential write to out_dir
+                base_opts['outtmpl'] = self.outtmpl
+                base_opts['paths'] = {'home': out_dir, 'temp': stage}
+
+        if _HAS_ARIA2 and options.get('use_aria2', True):
+            base_opts['external_downloader'] = 'aria2c'
+            base_opts['external_downloader_args'] = {
+                'aria2c': ['-x', '16', '-s', '16', '-k', '1M', '--file-allocation=none'],
+            }
 
         custom = options.get('ytdlp_opts') or {}
         base_opts.update(custom)
@@ -94,6 +277,8 @@ class YtDlpHandler:
         if verbose:
             base_opts['quiet'] = False
             base_opts['no_warnings'] = False
+            base_opts['noprogress'] = False
+            base_opts['logger'] = self.logger
 
         return base_opts
 
@@ -101,6 +286,7 @@ class YtDlpHandler:
         cookie_override = options.get('cookiefile') or options.get('cookie_path')
         if isinstance(cookie_override, str) and cookie_override:
             path = Path(cookie_override)
+            # the jar is saved with a plain open(); recreate a removed folder
             path.parent.mkdir(parents=True, exist_ok=True)
             return path
 
@@ -113,4 +299,4 @@ class YtDlpHandler:
         return cookie_path
 
 
-__all__ = ['YtDlpHandler', 'YTDLP_AVAILABLE']
+__all__ = ['YtDlpHandler', 'YTDLP_AVAILABLE', 'impersonate_opts']
@@ -4,15 +4,21 @@ Multi-source downloader UI
 Supports Google Drive, Instagram, TikTok, Threads, Twitter/X, Reddit, Facebook, YouTube.
 """
 
+import errno
 import logging
 import os
+import queue
+import re
 import shutil
 import threading
 import tkinter as tk
+from concurrent.futures import Future
 from tkinter import filedialog, messagebox, ttk
 
-from multidownloader.core import Downloader
+from multidownloader.batch import HostDispatcher, canonicalize_url, host_of
+from multidownloader.core import Downloader, preload
 from multidownloader import session_store
+from multidownloader.fs import ensure_dir
 
 logging.basicConfig(
     level=logging.INFO,
@@ -31,6 +37,30 @@ SOURCE_CHOICES = [
     'YouTube',
 ]
 
+# routes every URL by its host; unrecognised hosts are reported as errors
+AUTO_SOURCE = 'Auto (detect from URL)'
+
+# hosts Auto routes, matched exactly or as a dotted suffix (m.youtube.com)
+AUTO_HOSTS = {
+    'drive.google.com': 'Google Drive',
+    'docs.google.com': 'Google Drive',
+    'instagram.com': 'Instagram',
+    'instagr.am': 'Instagram',
+    'tiktok.com': 'TikTok',
+    'threads.net': 'Threads',
+    'threads.com': 'Threads',
+    'twitter.com': 'Twitter',
+    'x.com': 'Twitter',
+    'fxtwitter.com': 'Twitter',
+    'vxtwitter.com': 'Twitter',
+    'reddit.com': 'Reddit',
+    'redd.it': 'Reddit',
+    'facebook.com': 'Facebook',
+    'fb.watch': 'Facebook',
+    'youtube.com': 'YouTube',
+    'youtu.be': 'YouTube',
+}
+
 INSTAGRAM_AUTH_CHOICES = [
     'Auto (reuse saved session if available)',
     'Authenticated (prompt now)',
@@ -40,10 +70,143 @@ INSTAGRAM_AUTH_CHOICES = [
 COOKIE_SOURCES = {'TikTok', 'Threads', 'Twitter', 'Reddit', 'Facebook', 'YouTube'}
 
 
+def _opts_gdrive(ctx):
+    return {'method': 'public' if ctx['drive_method'].startswith('Public') else 'authenticated'}
+
+
+def _opts_instagram(ctx):
+    mode = ctx['insta_mode']
+    if mode.startswith('Authenticated'):
+        opts = {'auth': 'authenticated'}
+        if ctx.get('instaloader_client'):
+            opts['instaloader_client'] = ctx['instaloader_client']
+        return opts
+    if mode.startswith('Auto'):
+        return {'auth': 'auto'}
+    return {'auth': 'unauthenticated'}
+
+
+def _opts_cookie_source(ctx):
+    return {'use_session': True}
+
+
+# source -> builder of the handler options for one batch
+OPTS_BUILDERS = {
+    'Google Drive': _opts_gdrive,
+    'Instagram': _opts_instagram,
+    **dict.fromkeys(COOKIE_SOURCES, _opts_cookie_source),
+}
+
+# downloads in flight at once, and per host so a site doesn't rate-limit us
+MAX_CONCURRENT = max(1, int(os.environ.get('MSDL_MAX_CONCURRENT', '3')))
+PER_HOST_MAX = 2
+STATUS_POLL_MS = 100
+
+# pasted lists arrive comma-, space- or newline-separated
+_URL_SEP_RE = re.compile(r'[\s,;]+')
+
+_COPY_CHUNK = 1 << 20
+# the kernel copy paths report these when they cannot serve a pair of files
+_NO_KERNEL_COPY = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP}
+
+
+def _kernel_copy(copy, src_fd, dst_fd):
+    """Drive copy(src_fd, dst_fd) to EOF; False if the kernel refused the first call."""
+    copied = 0
+    while True:
+        try:
+            n = copy(src_fd, dst_fd)
+        except OSError as exc:
+            if copied or exc.errno not in _NO_KERNEL_COPY:
+                raise
+            return False
+        if not n:
+            return True
+        copied += n
+
+
+def _fastcopy(src, dst):
+    """Copy src to dst like shutil.copy2, keeping the bytes in the kernel when it can.
+
+    Tries copy_file_range (server-side on NFS/CoW filesystems), then sendfile,
+    then a readinto loop over one reused 1 MiB buffer. Like copy2, raises
+    shutil.SameFileError when both paths are the same file, before dst is
+    opened (and truncated).
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f'{src!r} and {dst!r} are the same file')
+    binary = getattr(os, 'O_BINARY', 0) | getattr(os, 'O_CLOEXEC', 0)
+    src_fd = os.open(src, os.O_RDONLY | binary)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | binary, 0o600)
+        try:
+            done = False
+            if hasattr(os, 'copy_file_range'):
+                done = _kernel_copy(lambda i, o: os.copy_file_range(i, o, _COPY_CHUNK), src_fd, dst_fd)
+            if not done and hasattr(os, 'sendfile'):
+                done = _kernel_copy(lambda i, o: os.sendfile(o, i, None, _COPY_CHUNK), src_fd, dst_fd)
+            if not done:
+                view = memoryview(bytearray(_COPY_CHUNK))
+                with open(src_fd, 'rb', buffering=0, closefd=False) as reader:
+                    while n := reader.readinto(view):
+                        chunk = view[:n]
+                        while chunk:
+                            chunk = chunk[os.write(dst_fd, chunk):]
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    shutil.copystat(src, dst)
+    return dst
+
+
+def _run_daemon(fn, *args):
+    """Run ``fn(*args)`` on a new daemon thread and return a Future for it.
+
+    ThreadPoolExecutor workers are joined at interpreter exit, so a download
+    still running when the window closes would keep an invisible process
+    alive. Daemon threads end with the process.
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = fn(*args)
+        except BaseException as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    threading.Thread(target=run, name=f'ui-{getattr(fn, "__name__", "task")}', daemon=True).start()
+    return future
+
+
+def _source_for_host(host):
+    """Return the AUTO_HOSTS source for ``host`` or one of its parent domains, else None."""
+    host = host.rpartition('@')[2].partition(':')[0].removeprefix('www.')
+    while host:
+        source = AUTO_HOSTS.get(host)
+        if source:
+            return source
+        host = host.partition('.')[2]
+    return None
+
+
 class DownloaderUI:
     def __init__(self, root):
         self.root = root
         root.title('Multi-Source Downloader')
+        self._log = logging.getLogger('multidownloader.ui')
+        self._core_log = logging.getLogger('multidownloader')
+        self._downloader = None
+        # set once the window is gone: workers stop starting downloads and
+        # stop posting Tk callbacks
+        self._closed = False
+        # sources whose handler library is already imported (or being imported)
+        self._preloaded = set()
+        root.protocol('WM_DELETE_WINDOW', self._shutdown)
 
         self.urls_var = tk.StringVar()
         self.dir_var = tk.StringVar()
@@ -55,7 +218,7 @@ class DownloaderUI:
         self.frm = ttk.Frame(self.root, padding=20)
         self.frm.pack(fill=tk.BOTH, expand=True)
 
-        ttk.Label(self.frm, text='Enter URLs (comma separated):', font=('Segoe UI', 10, 'bold')).grid(
+        ttk.Label(self.frm, text='Enter URLs (separated by commas or spaces):', font=('Segoe UI', 10, 'bold')).grid(
             row=0, column=0, columnspan=2, sticky='w', pady=(0, 5)
         )
         self.url_entry = ttk.Entry(self.frm, textvariable=self.urls_var, width=60)
@@ -69,7 +232,7 @@ class DownloaderUI:
         self.dir_entry.grid(row=2, column=1, sticky='w', pady=(0, 10), padx=(0, 5))
 
         ttk.Label(self.frm, text='Source:').grid(row=3, column=0, sticky='e', pady=(0, 5), padx=(0, 5))
-        self.src_menu = ttk.Combobox(self.frm, textvariable=self.source_var, values=SOURCE_CHOICES, state='readonly', width=20)
+        self.src_menu = ttk.Combobox(self.frm, textvariable=self.source_var, values=[AUTO_SOURCE, *SOURCE_CHOICES], state='readonly', width=22)
         self.src_menu.grid(row=3, column=1, sticky='w', pady=(0, 5), padx=(0, 5))
 
         self.drive_method_label = ttk.Label(self.frm, text='Method:')
@@ -97,6 +260,15 @@ class DownloaderUI:
         self.insta_method.grid(row=5, column=1, sticky='w', pady=(0, 5), padx=(0, 5))
         self.cookie_btn.grid(row=6, column=0, columnspan=2, pady=(0, 5))
 
+        # per-source optional controls; _update_controls only touches the ones that flip
+        self._controls_by_source = {
+            'Google Drive': frozenset((self.drive_method_label, self.drive_method)),
+            'Instagram': frozenset((self.insta_auth_label, self.insta_method)),
+            **dict.fromkeys(COOKIE_SOURCES, frozenset((self.cookie_btn,))),
+        }
+        # everything was gridded just above
+        self._visible_controls = frozenset().union(*self._controls_by_source.values())
+
         self.source_var.trace_add('write', self._update_controls)
         self._update_controls()
 
@@ -106,27 +278,35 @@ class DownloaderUI:
         self.status_label = ttk.Label(self.frm, textvariable=self.status_var, foreground='blue')
         self.status_label.grid(row=8, column=0, columnspan=2, sticky='w', pady=(0, 5))
 
+        # workers post status text here; the Tk thread shows only the latest
+        # message every STATUS_POLL_MS instead of running one callback per update
+        self._status_q = queue.SimpleQueue()
+        self.root.after(STATUS_POLL_MS, self._drain_status)
+
     # ------------------------------------------------------------------
     def _update_controls(self, *args):
         source = self.source_var.get()
-        if source == 'Google Drive':
-            self.drive_method_label.grid()
-            self.drive_method.grid()
-        else:
-            self.drive_method_label.grid_remove()
-            self.drive_method.grid_remove()
-
-        if source == 'Instagram':
-            self.insta_auth_label.grid()
-            self.insta_method.grid()
-        else:
-            self.insta_auth_label.grid_remove()
-            self.insta_method.grid_remove()
-
-        if source in COOKIE_SOURCES:
-            self.cookie_btn.grid()
-        else:
-            self.cookie_btn.grid_remove()
+        if source != AUTO_SOURCE and source not in self._preloaded:
+            # import the handler's library while the user is still filling in the form
+            self._preloaded.add(source)
+            _run_daemon(preload, source)
+        wanted = self._controls_by_source.get(source, frozenset())
+        for widget in self._visible_controls - wanted:
+            widget.grid_remove()
+        for widget in wanted - self._visible_controls:
+            widget.grid()
+        self._visible_controls = wanted
+
+    def _drain_status(self):
+        last = None
+        while True:
+            try:
+                last = self._status_q.get_nowait()
+            except queue.Empty:
+                break
+        if last is not None:
+            self.status_var.set(last)
+        self.root.after(STATUS_POLL_MS, self._drain_status)
 
     def select_directory(self):
         directory = filedialog.askdirectory()
@@ -141,89 +321,194 @@ class DownloaderUI:
         path = filedialog.askopenfilename(title='Select cookies.txt file')
         if not path:
             return
-        try:
-            dest = session_store.default_cookie_path(source)
-            dest.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(path, dest)
-            self.status_var.set(f'Imported cookies for {source} into {dest}')
-        except Exception as exc:
+        self.status_var.set(f'Importing cookies for {source}...')
+        # copied off the Tk thread so a slow network share never stalls the event loop
+        future = _run_daemon(self._do_cookie_copy, source, path)
+        future.add_done_callback(lambda fut: self._post(self._on_cookie_imported, source, fut))
+
+    @staticmethod
+    def _do_cookie_copy(source, path):
+        dest = session_store.default_cookie_path(source)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists() and os.path.samefile(path, dest):
+            return dest  # re-selected the imported file; nothing to copy
+        return _fastcopy(path, dest)
+
+    def _on_cookie_imported(self, source, future):
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            self.status_var.set('')
             messagebox.showerror('Cookie Import Failed', str(exc), parent=self.root)
+            return
+        self.status_var.set(f'Imported cookies for {source} into {future.result()}')
+
+    def _shutdown(self):
+        self._closed = True
+        self.root.destroy()
+
+    def _post(self, fn, *args):
+        """Schedule ``fn(*args)`` on the Tk thread from a worker; a no-op once the window is gone."""
+        if self._closed:
+            return
+        try:
+            self.root.after(0, fn, *args)
+        except (tk.TclError, RuntimeError):
+            # destroyed between the check and the call
+            pass
 
     def start_download(self):
-        urls = [u.strip() for u in self.urls_var.get().split(',') if u.strip()]
-        if not urls:
+        raw_urls = self.urls_var.get()
+        if not _URL_SEP_RE.sub('', raw_urls):
             messagebox.showerror('No URLs', 'Please enter one or more URLs', parent=self.root)
-            logging.warning('No URLs entered for download')
+            self._log.warning('No URLs entered for download')
             return
 
         out_dir = self.dir_var.get() or os.getcwd()
-        os.makedirs(out_dir, exist_ok=True)
-        logging.info('Starting download for URLs: %s -> %s', urls, out_dir)
+        ensure_dir(out_dir)
 
-        downloader = Downloader(out_dir, logger=logging.getLogger('multidownloader'))
+        # reuse handlers (and their cached sessions/loaders) across clicks
+        if self._downloader is None or self._downloader.out_dir != out_dir:
+            self._downloader = Downloader(out_dir, logger=self._core_log)
+        downloader = self._downloader
 
-        instaloader_client = None
-        if self.source_var.get() == 'Instagram' and self.insta_method_var.get().startswith('Authenticated'):
+        # Snapshot the selections once: the worker thread must not read Tk
+        # variables, and changing the dropdowns mid-run must not reroute the
+        # remaining URLs to a different handler.
+        ctx = {
+            'source': self.source_var.get(),
+            'drive_method': self.method_var.get(),
+            'insta_mode': self.insta_method_var.get(),
+        }
+
+        if ctx['source'] == 'Instagram' and ctx['insta_mode'].startswith('Authenticated'):
             try:
                 instaloader_client = downloader.authenticate('Instagram', root=self.root)
             except Exception as exc:
-                logging.error('Authentication call failed: %s', exc)
+                self._log.error('Authentication call failed: %s', exc)
                 messagebox.showerror('Authentication Error', str(exc), parent=self.root)
                 return
             if not instaloader_client:
-                logging.warning('Instagram authenticated client not acquired; aborting download')
+                self._log.warning('Instagram authenticated client not acquired; aborting download')
                 return
-
-        # Capture the selections now: the worker thread must not read Tk
-        # variables, and changing the dropdowns mid-run must not reroute the
-        # remaining URLs to a different handler.
-        source = self.source_var.get()
-        drive_method = self.method_var.get()
-        insta_mode = self.insta_method_var.get()
+            ctx['instaloader_client'] = instaloader_client
 
         self.download_btn.state(['disabled'])
         threading.Thread(
             target=self._download_with_core,
-            args=(downloader, urls, source, drive_method, insta_mode, instaloader_client),
+            args=(downloader, raw_urls, out_dir, ctx),
             daemon=True,
         ).start()
 
-    def _download_with_core(self, downloader, urls, source, drive_method, insta_mode, instaloader_client=None):
+    def _classify(self, raw_urls, source):
+        """Split the entry text and pair each URL with the source that downloads it.
+
+        Every URL goes to the selected ``source``; with AUTO_SOURCE each one is
+        routed by host, and unknown hosts keep AUTO_SOURCE to be reported.
+
+        Repeats of a URL (same link modulo case, fragment or utm_* params)
+        are dropped, keeping the first occurrence. Returns ``(tasks, errors)``;
+        URLs that cannot be parsed become ``(url, exc)`` errors.
+        """
+        tasks = {}
         errors = []
-        for url in urls:
-            opts = {}
-
-            if source == 'Google Drive':
-                opts['method'] = 'public' if drive_method.startswith('Public') else 'authenticated'
-
-            if source == 'Instagram':
-                if insta_mode.startswith('Authenticated'):
-                    opts['auth'] = 'authenticated'
-                    if instaloader_client:
-                        opts['instaloader_client'] = instaloader_client
-                elif insta_mode.startswith('Auto'):
-                    opts['auth'] = 'auto'
-                else:
-                    opts['auth'] = 'unauthenticated'
-
-            if source in COOKIE_SOURCES:
-                opts['use_session'] = True
-
-            self.root.after(0, self.status_var.set, f'Processing: {url}')
-            logging.info('Delegating download to core: %s %s %s', source, url, opts)
+        for url in _URL_SEP_RE.split(raw_urls.strip()):
+            if not url:
+                continue
             try:
-                downloader.download(source, url, opts)
-                logging.info('Download finished for %s', url)
-            except Exception as exc:
+                key = canonicalize_url(url)
+            except ValueError as exc:  # e.g. an unbalanced '[' in the host
+                self._log.error('Invalid URL %s: %s', url, exc)
                 errors.append((url, exc))
-                logging.error('Core download error for %s: %s', url, exc)
-                self.root.after(0, lambda err=exc: messagebox.showerror('Download Error', str(err), parent=self.root))
-
-        if errors:
-            self.root.after(0, self.status_var.set, f'Completed with {len(errors)} error(s)')
-        else:
-            self.root.after(0, self.status_var.set, 'All downloads completed successfully')
-        self.root.after(0, self.download_btn.state, ['!disabled'])
+                continue
+            if key in tasks:
+                self._log.debug('Skipping duplicate URL %s', url)
+                continue
+            if source == AUTO_SOURCE:
+                tasks[key] = (_source_for_host(host_of(url)) or AUTO_SOURCE, url)
+            else:
+                tasks[key] = (source, url)
+        return list(tasks.values()), errors
+
+    def _download_with_core(self, downloader, raw_urls, out_dir, ctx):
+        errors = []
+        try:
+            self._run_batch(downloader, raw_urls, out_dir, ctx, errors)
+        except Exception as exc:
+            self._log.exception('Download batch failed')
+            errors.append(('(batch)', exc))
+        finally:
+            # always reached, so the Download button can't stay disabled
+            if errors:
+                # one summary once the batch is done; a modal per failure would
+                # stall the event loop while the other downloads finish
+                self._post(self._show_error_summary, errors)
+                self._status_q.put(f'Completed with {len(errors)} error(s)')
+            else:
+                self._status_q.put('All downloads completed successfully')
+            self._post(self.download_btn.state, ['!disabled'])
+
+    def _run_batch(self, downloader, raw_urls, out_dir, ctx, errors):
+        # parsing runs here, off the Tk thread, so large pastes don't stall the UI
+        tasks, bad_urls = self._classify(raw_urls, ctx['source'])
+        errors.extend(bad_urls)
+        self._log.info('Starting download for URLs: %s -> %s', [url for _, url in tasks], out_dir)
+
+        opts_by_source = {}
+        # same-host URLs wait in the dispatcher, not in pool workers, so one
+        # busy host never holds every worker while other hosts sit idle
+        dispatcher = HostDispatcher(_run_daemon, MAX_CONCURRENT, PER_HOST_MAX)
+
+        def collect(done):
+            for future in done:
+                url, exc = future.result()
+                if exc is None:
+                    self._log.info('Download finished for %s', url)
+                    continue
+                errors.append((url, exc))
+                self._log.error('Core download error for %s: %s', url, exc)
+
+        for source, url in tasks:
+            if source == AUTO_SOURCE:
+                errors.append((url, ValueError('Could not detect the source for this URL')))
+                self._log.error('No handler recognises %s', url)
+                continue
+            opts = opts_by_source.get(source)
+            if opts is None:
+                opts = opts_by_source[source] = OPTS_BUILDERS[source](ctx)
+            collect(dispatcher.add(host_of(url), self._download_one, downloader, source, url, opts))
+        collect(dispatcher.drain())
+
+    def _show_error_summary(self, errors):
+        dlg = tk.Toplevel(self.root)
+        dlg.title('Download Errors')
+        dlg.transient(self.root)
+        frm = ttk.Frame(dlg, padding=12)
+        frm.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(frm, text=f'{len(errors)} download(s) failed:').pack(anchor='w', pady=(0, 6))
+
+        text = tk.Text(frm, width=90, height=min(20, 2 * len(errors) + 1), wrap='word')
+        scroll = ttk.Scrollbar(frm, orient=tk.VERTICAL, command=text.yview)
+        text.configure(yscrollcommand=scroll.set)
+        text.insert('1.0', '\n\n'.join(f'{url}\n    {exc}' for url, exc in errors))
+        text.configure(state='disabled')
+        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+        ttk.Button(dlg, text='Close', command=dlg.destroy).pack(pady=(0, 12))
+
+    def _download_one(self, downloader, source, url, opts):
+        """Run one download; returns (url, exc_or_None)."""
+        if self._closed:
+            return url, RuntimeError('Cancelled: the window was closed')
+        self._status_q.put(f'Processing: {url}')
+        self._log.info('Delegating download to core: %s %s %s', source, url, opts)
+        try:
+            downloader.download(source, url, opts)
+        except Exception as exc:
+            return url, exc
+        return url, None
 
 
 if __name__ == '__main__':
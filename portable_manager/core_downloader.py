@@ -4,15 +4,22 @@ Handles video downloading using yt-dlp with cookie authentication support.
 
 License: MIT (see LICENSE file in project root)
 """
+import atexit
 import os
 import sys
 import logging
+import threading
 from typing import Dict, Optional, Callable
 
 try:
     import yt_dlp
+    # bound once so the hot path skips the module attribute lookups
+    _YoutubeDL = yt_dlp.YoutubeDL
+    _DownloadError = yt_dlp.utils.DownloadError
 except ImportError:
     yt_dlp = None
+    _YoutubeDL = None
+    _DownloadError = None
 
 
 class PortableDownloader:
@@ -39,16 +46,47 @@ class PortableDownloader:
         self.output_dir = output_dir
         self.logger = self._setup_logger()
         self.cookie_file: Optional[str] = None
+        # progress listener that works with the shared YoutubeDL, unlike
+        # download_url's progress_hook, which needs a one-off instance
+        self.on_progress: Optional[Callable[[Dict], None]] = None
+        # invariant yt-dlp options; download_url copies this per URL
+        self._ydl_opts_template = {
+            'outtmpl': os.path.join(self.output_dir, '%(title)s.%(ext)s'),
+            'noplaylist': True,
+            'quiet': False,
+            'no_warnings': False,
+            'format': 'best',
+            # larger reads and ranged chunks for big sequential transfers;
+            # fragmented (HLS/DASH) formats fetch several pieces at once
+            'buffersize': 1024 * 1024,
+            'http_chunk_size': 4 * 1024 * 1024,
+            'concurrent_fragment_downloads': 4,
+            'http_headers': {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            },
+            'progress_hooks': [self._progress_hook],
+        }
+        # one YoutubeDL reused across URLs keeps its connections and parsed
+        # cookie jar; built on first download, rebuilt when cookies change
+        self._ydl = None
+        self._ydl_lock = threading.Lock()
+        # set by reload_cookies(); the next download rebuilds the shared instance
+        self._cookies_stale = False
         
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
+        os.makedirs(self.output_dir, exist_ok=True)
 
     def _setup_logger(self) -> logging.Logger:
-        """Configure and return the logger instance."""
+        """Configure and return the logger instance.
+
+        Handlers already attached (by an earlier instance or by the UI's
+        queue handler) are kept, so repeated instantiation neither duplicates
+        nor drops them.
+        """
         logger = logging.getLogger("PortableDownloader")
+        if logger.handlers:
+            return logger
+
         logger.setLevel(logging.DEBUG)
-        logger.handlers = []
-        
         handler = logging.StreamHandler(sys.stdout)
         handler.setLevel(logging.DEBUG)
         handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s', datefmt='%H:%M:%S'))
@@ -68,7 +106,9 @@ class PortableDownloader:
         """
         if path and os.path.exists(path):
             self.cookie_file = path
-            self.logger.info(f"Cookie file set: {path}")
+            self._ydl_opts_template['cookiefile'] = path
+            self._reset_ydl()
+            self.logger.info("Cookie file set: %s", path)
             return True
         return False
 
@@ -87,50 +127,83 @@ class PortableDownloader:
         if not yt_dlp:
             return {'status': 'error', 'error': 'yt-dlp module not found.'}
 
-        self.logger.info(f"URL: {url}")
-        self.logger.info(f"Output: {self.output_dir}")
+        self.logger.info("URL: %s", url)
+        self.logger.info("Output: %s", self.output_dir)
 
-        ydl_opts = {
-            'outtmpl': os.path.join(self.output_dir, '%(title)s.%(ext)s'),
-            'noplaylist': True,
-            'quiet': False,
-            'no_warnings': False,
-            'format': 'best',
-            'http_headers': {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            },
-        }
-
-        if self.cookie_file and os.path.exists(self.cookie_file):
-            ydl_opts['cookiefile'] = self.cookie_file
-            self.logger.info(f"Using cookies: {self.cookie_file}")
+        if self.cookie_file:
+            self.logger.info("Using cookies: %s", self.cookie_file)
 
-        def my_hook(d):
-            if d['status'] == 'downloading':
-                percent = d.get('_percent_str', '?%')
-                speed = d.get('_speed_str', '?')
-                self.logger.info(f"Downloading: {percent} at {speed}")
-            elif d['status'] == 'finished':
-                self.logger.info("Download finished, processing...")
+        try:
+            if progress_hook:
+                # caller-specific hooks need an instance of their own
+                ydl_opts = self._ydl_opts_template.copy()
+                ydl_opts['progress_hooks'] = [self._progress_hook, progress_hook]
+                with _YoutubeDL(ydl_opts) as ydl:
+                    self.logger.info("Extracting video info...")
+                    info = ydl.extract_info(url, download=True)
+            else:
+                with self._ydl_lock:
+                    self.logger.info("Extracting video info...")
+                    info = self._get_ydl().extract_info(url, download=True)
 
-        ydl_opts['progress_hooks'] = [my_hook]
+            if info:
+                title = info.get('title', 'Unknown')
+                self.logger.info("Completed: %s", title)
+                return {'status': 'success', 'info': info}
+            else:
+                return {'status': 'error', 'error': 'No video info returned'}
 
-        try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                self.logger.info("Extracting video info...")
-                info = ydl.extract_info(url, download=True)
-                
-                if info:
-                    title = info.get('title', 'Unknown')
-                    self.logger.info(f"Completed: {title}")
-                    return {'status': 'success', 'info': info}
-                else:
-                    return {'status': 'error', 'error': 'No video info returned'}
-                
-        except yt_dlp.utils.DownloadError as e:
+        except _DownloadError as e:
             error_msg = str(e)
-            self.logger.error(f"Download error: {error_msg}")
+            self.logger.error("Download error: %s", error_msg)
             return {'status': 'error', 'error': error_msg}
         except Exception as e:
-            self.logger.error(f"Error: {e}")
+            self.logger.error("Error: %s", e)
             return {'status': 'error', 'error': str(e)}
+
+    def reload_cookies(self):
+        """
+        Re-read the cookie file on the next download.
+        
+        Call this after replacing the file on disk. The current YoutubeDL
+        stops saving its jar at once, since closing it would write the old
+        cookies over the new file. It is rebuilt on the next download. Safe
+        to call while a download is running.
+        """
+        ydl = self._ydl
+        if ydl is not None:
+            ydl.params['cookiefile'] = None
+        self._cookies_stale = True
+
+    def _get_ydl(self):
+        """Return the shared YoutubeDL; the caller holds ``_ydl_lock``."""
+        if self._ydl is not None and self._cookies_stale:
+            self._close_ydl()
+        if self._ydl is None:
+            self._cookies_stale = False
+            self._ydl = _YoutubeDL(self._ydl_opts_template.copy())
+            atexit.register(self._ydl.close)
+        return self._ydl
+
+    def _close_ydl(self):
+        atexit.unregister(self._ydl.close)
+        self._ydl.close()
+        self._ydl = None
+
+    def _reset_ydl(self):
+        """Close the shared YoutubeDL so the next download picks up new options."""
+        with self._ydl_lock:
+            if self._ydl is not None:
+                self._close_ydl()
+
+    def _progress_hook(self, d: Dict):
+        """Log yt-dlp progress updates."""
+        if d['status'] == 'downloading':
+            percent = d.get('_percent_str', '?%')
+            speed = d.get('_speed_str', '?')
+            # tagged so UI filters can rate-limit the per-chunk chatter
+            self.logger.info("Downloading: %s at %s", percent, speed, extra={'progress': True})
+        elif d['status'] == 'finished':
+            self.logger.info("Download finished, processing...")
+        if self.on_progress is not None:
+            self.on_progress(d)
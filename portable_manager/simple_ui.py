@@ -7,11 +7,11 @@ License: MIT (see LICENSE file in project root)
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext
 import threading
+import time
 import os
-import shutil
-import webbrowser
 import ctypes
 import logging
+import logging.handlers
 import queue
 from core_downloader import PortableDownloader
 
@@ -24,16 +24,71 @@ except Exception:
     except Exception:
         pass
 
+# cookies.txt lives next to the app; resolved once, abspath walks the cwd
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
 
-class QueueHandler(logging.Handler):
-    """Custom logging handler that sends logs to a queue for thread-safe UI updates."""
+# status-line progress refreshes at most this often (seconds)
+PROGRESS_INTERVAL = 0.05
+
+# the log view keeps only this many trailing lines; Tk's Text slows as it grows
+MAX_LOG_LINES = 2000
+
+
+class UILogSink(logging.Handler):
+    """Logging handler that pushes formatted lines onto the UI's display queue.
+
+    It runs on the QueueListener thread, so neither the downloader thread
+    nor the Tk thread pays for formatting. ``notify`` wakes the Tk thread.
+    """
     
-    def __init__(self, log_queue):
+    def __init__(self, log_queue, notify):
         super().__init__()
         self.log_queue = log_queue
+        self.notify = notify
 
     def emit(self, record):
         self.log_queue.put(self.format(record))
+        self.notify()
+
+
+def _open_extension_page():
+    """Open the cookies.txt extension search in the default browser."""
+    import webbrowser  # only needed on click; keeps it off the startup path
+    webbrowser.open("https://microsoftedge.microsoft.com/addons/search/cookies.txt")
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that enqueues records untouched.
+
+    The stock prepare() formats each record on the logging thread so it
+    can be pickled; this queue never leaves the process, so all formatting
+    is left to the listener.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class ProgressThrottle(logging.Filter):
+    """Drop progress records that arrive within ``interval`` seconds of the last one kept.
+
+    yt-dlp reports progress many times a second; a few lines a second is
+    plenty for the log view. Records without the ``progress`` flag pass.
+    """
+
+    def __init__(self, interval=0.25):
+        super().__init__()
+        self.interval = interval
+        self.last_emit = 0.0
+
+    def filter(self, record):
+        if not getattr(record, 'progress', False):
+            return True
+        now = time.perf_counter()
+        if now - self.last_emit < self.interval:
+            return False
+        self.last_emit = now
+        return True
 
 
 class SimpleDownloaderUI:
@@ -44,12 +99,20 @@ class SimpleDownloaderUI:
         self.root.title("Simple YouTube Downloader")
         self.root.geometry("650x550")
         self.root.resizable(True, True)
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         
-        self.log_queue = queue.Queue()
+        self.log_queue = queue.SimpleQueue()
+        self._log_line_count = 0
+        # set while a <<LogArrived>> wakeup is queued, so bursts post only one
+        self._log_pending = False
+        self._closing = False
+        # downloads run one at a time on a single long-lived worker; None stops it
+        self._job_q = queue.SimpleQueue()
+        threading.Thread(target=self._worker_loop, name="download-worker", daemon=True).start()
+        self.root.bind("<<LogArrived>>", lambda event: self._drain_log_queue())
         self._setup_ui()
         self._setup_logging()
         self._check_existing_cookies()
-        self._poll_log_queue()
 
     def _setup_ui(self):
         """Initialize all UI components."""
@@ -77,7 +140,7 @@ class SimpleDownloaderUI:
         ttk.Button(
             cookie_row, 
             text="Get Extension",
-            command=lambda: webbrowser.open("https://microsoftedge.microsoft.com/addons/search/cookies.txt")
+            command=_open_extension_page
         ).pack(side=tk.RIGHT)
         
         # Output Directory
@@ -111,34 +174,75 @@ class SimpleDownloaderUI:
         self.cookie_file = None
 
     def _setup_logging(self):
-        """Configure logging to display in the UI."""
-        handler = QueueHandler(self.log_queue)
-        handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s', datefmt='%H:%M:%S'))
+        """Configure logging to display in the UI.
+
+        The downloader thread only enqueues records; a QueueListener formats
+        them and hands the lines to the display queue drained by Tk.
+        """
+        record_queue = queue.SimpleQueue()
+        sink = UILogSink(self.log_queue, self._notify_log)
+        sink.setFormatter(logging.Formatter('%(asctime)s - %(message)s', datefmt='%H:%M:%S'))
+        self._log_listener = logging.handlers.QueueListener(record_queue, sink, respect_handler_level=True)
+        self._log_listener.start()
         
+        self._log_handler = RecordQueueHandler(record_queue)
+        # filtered here, on the downloader thread, before anything is queued
+        self._log_handler.addFilter(ProgressThrottle())
         logger = logging.getLogger("PortableDownloader")
-        logger.addHandler(handler)
-        logger.setLevel(logging.DEBUG)
+        logger.addHandler(self._log_handler)
+        logger.setLevel(logging.INFO)
 
-    def _poll_log_queue(self):
-        """Poll the log queue and update the UI with new messages."""
-        while True:
-            try:
-                msg = self.log_queue.get_nowait()
-                self.log_text.config(state=tk.NORMAL)
-                self.log_text.insert(tk.END, msg + "\n")
-                self.log_text.see(tk.END)
-                self.log_text.config(state=tk.DISABLED)
-            except queue.Empty:
-                break
-        self.root.after(100, self._poll_log_queue)
+    def _on_close(self):
+        """Stop the log listener thread and close the window."""
+        self._closing = True
+        self._job_q.put(None)
+        logging.getLogger("PortableDownloader").removeHandler(self._log_handler)
+        # no join: the listener may be waiting on this thread inside notify
+        self._log_listener.enqueue_sentinel()
+        self.root.destroy()
+
+    def _notify_log(self):
+        """Wake the Tk thread to drain the log queue; callable from any thread."""
+        if self._log_pending or self._closing:
+            return
+        self._log_pending = True
+        try:
+            self.root.event_generate("<<LogArrived>>", when="tail")
+        except (tk.TclError, RuntimeError):
+            # window is going away
+            pass
+
+    def _drain_log_queue(self):
+        """Move queued log lines into the log display."""
+        # cleared before draining so lines queued meanwhile post a new wakeup
+        self._log_pending = False
+        # drain everything first so a burst costs one insert, not one per line
+        msgs = []
+        try:
+            while True:
+                msgs.append(self.log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if msgs:
+            text = "\n".join(msgs) + "\n"
+            self._log_line_count += text.count("\n")
+            self.log_text.config(state=tk.NORMAL)
+            self.log_text.insert(tk.END, text)
+            if self._log_line_count > MAX_LOG_LINES:
+                excess = self._log_line_count - MAX_LOG_LINES
+                self.log_text.delete("1.0", f"{excess + 1}.0")
+                self._log_line_count = MAX_LOG_LINES
+            self.log_text.see(tk.END)
+            self.log_text.config(state=tk.DISABLED)
 
     def _log(self, message):
         """Add a message to the log display."""
         self.log_queue.put(message)
+        self._notify_log()
 
     def _check_existing_cookies(self):
         """Check if cookies.txt exists in app directory."""
-        local_cookie = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cookies.txt")
+        local_cookie = os.path.join(_APP_DIR, "cookies.txt")
         if os.path.exists(local_cookie):
             self.cookie_file = local_cookie
             self.cookie_status_var.set("cookies.txt loaded")
@@ -152,9 +256,18 @@ class SimpleDownloaderUI:
             filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
         )
         if path:
+            import shutil  # only needed here; keeps it off the startup path
             try:
-                dest = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cookies.txt")
-                shutil.copy2(path, dest)
+                dest = os.path.join(_APP_DIR, "cookies.txt")
+                # before the copy: stop the live YoutubeDL from saving its old
+                # jar over the new file, and have the next download re-read it
+                if self.downloader is not None:
+                    self.downloader.reload_cookies()
+                # re-selecting the app's own cookies.txt needs no copy; otherwise
+                # copy contents only (no stat/metadata pass). Not a hardlink:
+                # yt-dlp rewrites the jar and must not touch the user's export.
+                if not (os.path.exists(dest) and os.path.samefile(path, dest)):
+                    shutil.copyfile(path, dest)
                 self.cookie_file = dest
                 self.cookie_status_var.set("cookies.txt imported")
                 self.cookie_status.config(foreground="green")
@@ -178,25 +291,39 @@ class SimpleDownloaderUI:
         # Clear log
         self.log_text.config(state=tk.NORMAL)
         self.log_text.delete(1.0, tk.END)
+        self._log_line_count = 0
         self.log_text.config(state=tk.DISABLED)
         
         output_dir = self.dir_var.get().strip() or "downloads"
-        self.downloader = PortableDownloader(output_dir)
-        
-        if self.cookie_file:
-            self.downloader.set_cookie_file(self.cookie_file)
         
         self.download_btn.config(state=tk.DISABLED)
         self.status_var.set("Downloading...")
         self.status_label.config(foreground="blue")
         self._log(f"Starting download: {url}")
         
-        thread = threading.Thread(target=self._download_task, args=(url,), daemon=True)
-        thread.start()
+        self._job_q.put((url, output_dir, self.cookie_file))
+
+    def _worker_loop(self):
+        """Run queued downloads until the None sentinel arrives."""
+        while True:
+            job = self._job_q.get()
+            if job is None:
+                return
+            self._download_task(*job)
 
-    def _download_task(self, url):
+    def _download_task(self, url, output_dir, cookie_file):
         """Background task for downloading (runs in separate thread)."""
         try:
+            # built here, not on the Tk thread: construction creates the output
+            # folder. Kept while the folder is unchanged so yt-dlp is reused.
+            if self.downloader is None or self.downloader.output_dir != output_dir:
+                if self.downloader is not None:
+                    # save its jar now so the new instance loads the latest cookies
+                    self.downloader._reset_ydl()
+                self.downloader = PortableDownloader(output_dir)
+                self.downloader.on_progress = self._make_progress_forwarder()
+            if cookie_file and cookie_file != self.downloader.cookie_file:
+                self.downloader.set_cookie_file(cookie_file)
             result = self.downloader.download_url(url)
             if result['status'] == 'success':
                 title = result['info'].get('title', 'Video') if result['info'] else 'Video'
@@ -206,6 +333,31 @@ class SimpleDownloaderUI:
         except Exception as e:
             self.root.after(0, lambda: self._on_error(str(e)))
 
+    def _make_progress_forwarder(self):
+        """Return a yt-dlp progress callback that updates the status line.
+
+        It runs on the download thread and hands off to Tk at most every
+        PROGRESS_INTERVAL seconds; 'finished' always gets through.
+        """
+        last = 0.0
+
+        def forward(d):
+            nonlocal last
+            now = time.perf_counter()
+            if now - last < PROGRESS_INTERVAL and d.get('status') != 'finished':
+                return
+            last = now
+            self.root.after(0, self._update_progress, d)
+
+        return forward
+
+    def _update_progress(self, d):
+        """Show yt-dlp progress in the status line."""
+        if d.get('status') == 'finished':
+            self.status_var.set("Processing...")
+        else:
+            self.status_var.set(f"Downloading... {d.get('_percent_str', '').strip()} at {d.get('_speed_str', '?').strip()}")
+
     def _on_success(self, title):
         """Handle successful download completion."""
         self.status_var.set(f"Downloaded: {title}")
@@ -1,5 +1,7 @@
 import json
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 
@@ -8,6 +10,7 @@ from multidownloader.batch import (
     detect_handler,
     execute_batch,
     load_manifest,
+    match_alias,
 )
 
 
@@ -22,6 +25,27 @@ class FakeDownloader:
             raise RuntimeError('simulated failure')
 
 
+class SlowDownloader(FakeDownloader):
+    """Records the peak number of concurrent calls per source."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._lock = threading.Lock()
+        self.active = {}
+        self.peak = {}
+
+    def download(self, source_name, url, options):
+        with self._lock:
+            self.active[source_name] = self.active.get(source_name, 0) + 1
+            self.peak[source_name] = max(self.peak.get(source_name, 0), self.active[source_name])
+        try:
+            time.sleep(0.02)
+            super().download(source_name, url, options)
+        finally:
+            with self._lock:
+                self.active[source_name] -= 1
+
+
 class BatchTests(unittest.TestCase):
     def test_detect_handler_resolves_known_hosts(self):
         self.assertEqual('Twitter', detect_handler('twitter', 'https://twitter.com/example/status/1'))
@@ -29,6 +53,14 @@ class BatchTests(unittest.TestCase):
         self.assertEqual('Threads', detect_handler('threads', 'https://www.threads.net/@user/post/3'))
         self.assertEqual('YouTube', detect_handler('', 'https://youtu.be/abc'))
         self.assertIsNone(detect_handler('unknown', 'https://example.com/video/1'))
+        self.assertEqual('Reddit', detect_handler('', 'HTTPS://WWW.Reddit.com/r/test'))
+        self.assertIsNone(detect_handler('', 'not a url youtube.com'))
+
+    def test_match_alias_prefers_earliest_alias(self):
+        # both 'instagram' and 'threads' occur; ALIAS_MAP order decides
+        self.assertEqual('Instagram', match_alias('threads.instagram.com'))
+        self.assertEqual('Twitter', match_alias('X.com'))
+        self.assertIsNone(match_alias(''))
 
     def test_load_manifest_json_object(self):
         with tempfile.TemporaryDirectory() as tmp:
@@ -40,6 +72,41 @@ class BatchTests(unittest.TestCase):
             self.assertEqual('twitter', manifest[0].source_hint)
             self.assertEqual('https://twitter.com/example/status/1', manifest[0].url)
 
+    def test_load_manifest_json_array_and_nested_items(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            array_path = Path(tmp) / 'items.json'
+            array_path.write_text(json.dumps([
+                {'source': 'reddit', 'url': ' https://redd.it/abc '},
+                {'url': 'https://youtu.be/xyz'},
+                'not-an-entry',
+            ]), encoding='utf-8')
+            manifest = load_manifest(array_path)
+            self.assertEqual([('reddit', 'https://redd.it/abc'), ('', 'https://youtu.be/xyz')],
+                             [(item.source_hint, item.url) for item in manifest])
+
+            nested_path = Path(tmp) / 'nested.json'
+            nested_path.write_text(json.dumps({'tiktok': {'items': ['https://www.tiktok.com/@u/video/1', '']}}), encoding='utf-8')
+            manifest = load_manifest(nested_path)
+            self.assertEqual(1, len(manifest))
+            self.assertEqual('tiktok', manifest[0].source_hint)
+
+    def test_load_manifest_csv(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'grouped.csv'
+            path.write_text(
+                'Source,count,items_comma_separated\n'
+                'twitter,2,"https://twitter.com/a/status/1, https://x.com/b/status/2"\n'
+                '\n'
+                'reddit,0,\n'
+                'short\n',
+                encoding='utf-8',
+            )
+            manifest = load_manifest(path)
+        self.assertEqual(
+            [('twitter', 'https://twitter.com/a/status/1'), ('twitter', 'https://x.com/b/status/2')],
+            [(item.source_hint, item.url) for item in manifest],
+        )
+
     def test_execute_batch_respects_limits_and_options(self):
         items = [
             ManifestItem('instagram', 'https://www.instagram.com/p/abc/'),
@@ -76,6 +143,72 @@ class BatchTests(unittest.TestCase):
         self.assertEqual(1, len(result['errors']))
         self.assertEqual(0, len(result['skipped']))
 
+    def test_execute_batch_skips_duplicates_and_resumes(self):
+        items = [
+            ManifestItem('twitter', 'https://twitter.com/example/status/1?utm_source=feed'),
+            ManifestItem('twitter', 'https://TWITTER.com/example/status/1#top'),
+            ManifestItem('reddit', 'https://www.reddit.com/r/test/comments/xyz'),
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            first = FakeDownloader()
+            result = execute_batch(items, Path(tmp), downloader=first, resume=True)
+            self.assertEqual(2, len(first.calls))
+            self.assertEqual([('twitter', items[1].url, 'duplicate')], result['skipped'])
+
+            second = FakeDownloader()
+            result = execute_batch(items, Path(tmp), downloader=second, resume=True)
+        self.assertEqual([], second.calls)
+        self.assertEqual({'already-completed'}, {reason for *_rest, reason in result['skipped']})
+
+    def test_execute_batch_parallel_respects_per_host_max(self):
+        items = [ManifestItem('twitter', f'https://twitter.com/example/status/{i}') for i in range(6)]
+        items += [ManifestItem('reddit', f'https://www.reddit.com/r/t/comments/{i}') for i in range(3)]
+        items.append(ManifestItem('twitter', 'https://twitter.com/fail/status/99'))
+        fake = SlowDownloader(fail_tokens={'fail'})
+        with tempfile.TemporaryDirectory() as tmp:
+            result = execute_batch(items, Path(tmp), downloader=fake, max_workers=4, per_host_max=2)
+        self.assertEqual(10, len(fake.calls))
+        self.assertEqual(9, len(result['completed']))
+        self.assertEqual(1, len(result['errors']))
+        self.assertLessEqual(fake.peak['Twitter'], 2)
+
+    def test_execute_batch_keeps_other_hosts_moving_while_one_is_saturated(self):
+        # Twitter items block until the Reddit item has run; with a worker
+        # left over after Twitter's two slots, Reddit must get it.
+        reddit_done = threading.Event()
+        unblocked = []
+
+        class GatedDownloader(FakeDownloader):
+            def download(self, source_name, url, options):
+                super().download(source_name, url, options)
+                if source_name == 'Reddit':
+                    reddit_done.set()
+                else:
+                    unblocked.append(reddit_done.wait(5))
+
+        items = [ManifestItem('twitter', f'https://twitter.com/example/status/{i}') for i in range(4)]
+        items.append(ManifestItem('reddit', 'https://www.reddit.com/r/t/comments/1'))
+        fake = GatedDownloader()
+        with tempfile.TemporaryDirectory() as tmp:
+            result = execute_batch(items, Path(tmp), downloader=fake, max_workers=3, per_host_max=2)
+        self.assertEqual(5, len(result['completed']))
+        self.assertEqual([True] * 4, unblocked)
+
+    def test_execute_batch_does_not_read_far_ahead_of_the_downloads(self):
+        fake = SlowDownloader()
+        lead = []
+
+        def items():
+            for i in range(60):
+                lead.append(i - len(fake.calls))
+                yield ManifestItem('twitter', f'https://twitter.com/example/status/{i}')
+
+        with tempfile.TemporaryDirectory() as tmp:
+            result = execute_batch(items(), Path(tmp), downloader=fake, max_workers=2, per_host_max=2)
+        self.assertEqual(60, len(result['completed']))
+        # at most 4 * max_workers queued plus max_workers running (and one in hand)
+        self.assertLessEqual(max(lead), 4 * 2 + 2 + 1)
+
 
 if __name__ == '__main__':
     unittest.main()
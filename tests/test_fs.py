@@ -0,0 +1,30 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from multidownloader import fs
+
+
+class EnsureDirTests(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        fs.invalidate()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_creates_once_until_invalidated(self):
+        target = os.path.join(self.root, 'a', 'b')
+        self.assertEqual(target, fs.ensure_dir(target))
+        self.assertTrue(os.path.isdir(target))
+        os.rmdir(target)
+        fs.ensure_dir(target)
+        self.assertFalse(os.path.exists(target))  # cached, no syscall
+        fs.invalidate(target)
+        fs.ensure_dir(target)
+        self.assertTrue(os.path.isdir(target))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,14 @@
 import unittest
 import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
 
+from multidownloader import core, fs
 from multidownloader.core import Downloader
 from multidownloader.sources.instagram import InstagramHandler
-from multidownloader.sources.gdrive import GoogleDriveHandler
+from multidownloader.sources.gdrive import GoogleDriveHandler, parse_drive_id
 from multidownloader.sources.tiktok import TikTokHandler
 from multidownloader.sources.threads import ThreadsHandler
 from multidownloader.sources.twitter import TwitterHandler
@@ -22,6 +27,30 @@ class HandlerImportTests(unittest.TestCase):
         h = GoogleDriveHandler()
         self.assertIsNotNone(h)
 
+    def test_gdrive_recreates_a_deleted_output_folder(self):
+        seen = []
+
+        class StubDriveHandler(GoogleDriveHandler):
+            def _download_public_file(self, url, out_dir):
+                seen.append(os.path.isdir(out_dir))
+                return True
+
+        h = StubDriveHandler()
+        with tempfile.TemporaryDirectory() as tmp:
+            out_dir = os.path.join(tmp, 'out')
+            h.download('https://drive.google.com/file/d/abc/view', out_dir, {})
+            os.rmdir(out_dir)
+            h.download('https://drive.google.com/file/d/abc/view', out_dir, {})
+        self.assertEqual([True, True], seen)
+
+    def test_parse_drive_id_shapes(self):
+        self.assertEqual(('abc-1', 'file'), parse_drive_id('https://drive.google.com/file/d/abc-1/view?usp=sharing'))
+        self.assertEqual(('abc_2', 'file'), parse_drive_id('https://drive.google.com/uc?id=abc_2&export=download'))
+        self.assertEqual(('abc3', 'file'), parse_drive_id('https://drive.google.com/open?id=abc3'))
+        self.assertEqual(('fold1', 'folder'), parse_drive_id('https://drive.google.com/drive/u/0/folders/fold1'))
+        self.assertEqual(('fold2', 'folder'), parse_drive_id('https://drive.google.com/folderview?id=fold2'))
+        self.assertEqual((None, None), parse_drive_id('https://drive.google.com/'))
+
     def test_tiktok_handler_import(self):
         h = TikTokHandler()
         self.assertIsNotNone(h)
@@ -51,6 +80,33 @@ class HandlerImportTests(unittest.TestCase):
         expected = {'Google Drive', 'Instagram', 'TikTok', 'Threads', 'Twitter', 'Reddit', 'Facebook', 'YouTube'}
         self.assertTrue(expected.issubset(set(d.list_sources())))
 
+    def test_downloader_builds_handlers_on_demand(self):
+        d = Downloader(os.getcwd())
+        handler = d.get_handler('YouTube')
+        self.assertIsInstance(handler, YouTubeHandler)
+        self.assertIs(handler, d.get_handler('YouTube'))
+        with self.assertRaises(ValueError):
+            d.get_handler('Nope')
+
+    def test_handler_modules_defer_third_party_imports(self):
+        # a fresh interpreter: this process already has the libraries loaded
+        code = (
+            'import sys\n'
+            'from multidownloader import batch, core\n'
+            'from multidownloader.sources import gdrive, instagram, youtube\n'
+            "print(','.join(m for m in ('yt_dlp', 'instaloader', 'gdown', 'pydrive2') if m in sys.modules))\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        out = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+        self.assertEqual('', out.stdout.strip())
+
+    def test_preload_imports_handler_library(self):
+        core.preload('YouTube')
+        if YTDLP_AVAILABLE:
+            self.assertIn('yt_dlp', sys.modules)
+        with self.assertRaises(ValueError):
+            core.preload('Nope')
+
     def test_instagram_download_without_instaloader(self):
         h = InstagramHandler()
         if not getattr(h, 'logger'):
@@ -59,6 +115,109 @@ class HandlerImportTests(unittest.TestCase):
             with self.assertRaises(RuntimeError):
                 h.download('https://instagram.com/p/INVALID', os.getcwd(), {})
 
+    def test_instagram_reuses_loader_until_forgotten(self):
+        h = InstagramHandler()
+        if not __import__('importlib').util.find_spec('instaloader'):
+            self.skipTest('instaloader not installed')
+        loader = h._ensure_loader(None, 'unauthenticated')
+        self.assertIs(loader, h._ensure_loader(None, 'unauthenticated'))
+        h._forget_loader(loader)
+        self.assertIsNot(loader, h._ensure_loader(None, 'unauthenticated'))
+
+    def test_instagram_serialises_downloads_sharing_a_loader(self):
+        class Loader:
+            pass
+
+        h = InstagramHandler()
+        loader, other = Loader(), Loader()
+        self.assertIs(h._use_lock(loader), h._use_lock(loader))
+        self.assertIsNot(h._use_lock(loader), h._use_lock(other))
+
+    def test_instagram_prefetches_sidecar_items_in_parallel(self):
+        from datetime import datetime
+        from types import SimpleNamespace
+
+        calls = []
+        loader = SimpleNamespace(
+            dirname_pattern='{target}', filename_pattern='{date_utc}_UTC',
+            slide_start=0, slide_end=-1,
+            download_pictures=True, download_videos=True, download_video_thumbnails=False,
+            format_filename=lambda post, target: 'stamp',
+            download_pic=lambda filename, url, mtime, filename_suffix=None: calls.append((filename, url, filename_suffix)),
+        )
+        nodes = [SimpleNamespace(display_url='img1', video_url=None), SimpleNamespace(display_url='thumb2', video_url='vid2')]
+        post = SimpleNamespace(
+            typename='GraphSidecar', mediacount=2, shortcode='abc', date_local=datetime(2024, 1, 1),
+            get_sidecar_nodes=lambda start, end: iter(nodes),
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / 'abc'
+            try:
+                InstagramHandler()._prefetch_sidecar(loader, post, target)
+            finally:
+                fs.invalidate(target)
+        template = str(target / 'stamp')
+        self.assertEqual({(template, 'img1', '1'), (template, 'vid2', '2')}, set(calls))
+
+
+class DownloadManyTests(unittest.TestCase):
+    def test_download_many_runs_every_url_and_reraises_first_failure(self):
+        shares = []
+
+        class StubHandler(YouTubeHandler):
+            def _download_urls(self, urls, out_dir, options, prepared=None):
+                shares.append(list(urls))
+                return [(url, ValueError(url)) for url in urls if url.endswith('bad')]
+
+        h = StubHandler()
+        self.assertTrue(h.download_many(['u1', 'u2', 'u3'], os.getcwd(), max_workers=2))
+        self.assertEqual([['u1', 'u3'], ['u2']], sorted(shares))
+        with self.assertRaises(RuntimeError):
+            h.download_many(['u4', 'bad', 'u5'], os.getcwd())
+        self.assertEqual({'u1', 'u2', 'u3', 'u4', 'bad', 'u5'}, {url for share in shares for url in share})
+
+
+class YtDlpOptionTests(unittest.TestCase):
+    def test_fragment_count_tolerates_missing_and_out_of_range_values(self):
+        h = YouTubeHandler()
+
+        def fragments(value):
+            return h._build_opts(os.getcwd(), {'fragments': value})['concurrent_fragment_downloads']
+
+        self.assertEqual(8, fragments(None))
+        self.assertEqual(8, fragments(0))
+        self.assertEqual(16, fragments(64))
+        self.assertEqual(4, fragments('4'))
+        self.assertEqual(1, fragments(-3))
+
+
+@unittest.skipUnless(YTDLP_AVAILABLE, 'yt-dlp not installed')
+class YtDlpCookieTests(unittest.TestCase):
+    COOKIE_LINE = '.example.com\tTRUE\t/\tFALSE\t2000000000\tname\tvalue\n'
+
+    def test_cookie_jar_is_only_written_when_it_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cookie_path = Path(tmp) / 'cookies.txt'
+            opts = {'cookiefile': str(cookie_path)}
+            h = YouTubeHandler()
+            self.assertEqual([], h._download_urls([], tmp, opts))
+            self.assertFalse(cookie_path.exists())
+
+            cookie_path.write_text('# Netscape HTTP Cookie File\n' + self.COOKIE_LINE)
+            os.utime(cookie_path, ns=(0, 0))
+            h._download_urls([], tmp, opts)
+            self.assertEqual(0, cookie_path.stat().st_mtime_ns)
+
+            class RefreshingHandler(YouTubeHandler):
+                def _load_cookies(self, ydl, path):
+                    loaded = super()._load_cookies(ydl, path)
+                    for cookie in ydl.cookiejar:
+                        cookie.value = 'refreshed'
+                    return loaded
+
+            RefreshingHandler()._download_urls([], tmp, opts)
+            self.assertIn('refreshed', cookie_path.read_text())
+
 
 @unittest.skipUnless(YTDLP_AVAILABLE, 'yt-dlp not installed')
 class YtDlpAvailabilityTests(unittest.TestCase):
@@ -0,0 +1,52 @@
+import shutil
+import unittest
+
+from multidownloader import session_store
+
+SOURCE = 'Unit Test Store'
+
+
+class SessionStoreTests(unittest.TestCase):
+    def tearDown(self):
+        shutil.rmtree(session_store.ensure_session_dir(SOURCE), ignore_errors=True)
+
+    def test_sanitize_source_names(self):
+        self.assertEqual('google_drive', session_store._sanitize('Google Drive'))
+        self.assertEqual('default', session_store._sanitize('__'))
+        self.assertEqual('ünï_x', session_store._sanitize('Ünï-x'))
+
+    def test_missing_files_read_as_none(self):
+        self.assertIsNone(session_store.read_json(SOURCE, 'missing.json'))
+        self.assertIsNone(session_store.read_text(SOURCE, 'missing.txt'))
+        self.assertIsNone(session_store.load_default_session(SOURCE, filename='missing.bin'))
+
+    def test_round_trip_writes_leave_no_temp_files(self):
+        session_store.write_json(SOURCE, 'meta.json', {'username': 'someone'})
+        session_store.write_text(SOURCE, 'cookies.txt', '# Netscape HTTP Cookie File\n')
+        session_store.write_default_session(SOURCE, b'\x00session')
+        self.assertEqual({'username': 'someone'}, session_store.read_json(SOURCE, 'meta.json'))
+        self.assertEqual('# Netscape HTTP Cookie File\n', session_store.read_text(SOURCE, 'cookies.txt'))
+        self.assertEqual(b'\x00session', session_store.load_default_session(SOURCE))
+        self.assertEqual({'meta.json', 'cookies.txt', 'session.bin'}, set(session_store.list_files(SOURCE)))
+
+    def test_unchanged_json_is_not_rewritten(self):
+        path = session_store.write_json(SOURCE, 'meta.json', {'username': 'someone'})
+        inode = path.stat().st_ino
+        session_store.write_json(SOURCE, 'meta.json', {'username': 'someone'})
+        self.assertEqual(inode, path.stat().st_ino)
+        session_store.read_json(SOURCE, 'meta.json')['username'] = 'mutated'
+        self.assertEqual({'username': 'someone'}, session_store.read_json(SOURCE, 'meta.json'))
+        session_store.write_json(SOURCE, 'meta.json', {'username': 'other'})
+        self.assertNotEqual(inode, path.stat().st_ino)
+        self.assertEqual({'username': 'other'}, session_store.read_json(SOURCE, 'meta.json'))
+
+    def test_write_recreates_removed_session_dir(self):
+        directory = session_store.ensure_session_dir(SOURCE)
+        shutil.rmtree(directory, ignore_errors=True)
+        self.assertEqual({}, session_store.list_files(SOURCE))
+        session_store.write_text(SOURCE, 'note.txt', 'hi')
+        self.assertEqual('hi', session_store.read_text(SOURCE, 'note.txt'))
+
+
+if __name__ == '__main__':
+    unittest.main()